@@ -1,19 +1,29 @@
 """JWT and password hashing."""
+import time
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Optional, Tuple
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
 
 from config import settings
 from database import SessionLocal, get_db
 from models.user import User
+from services.auth_cache import ExpiringLRU
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Request paths hash on the process pool (services.passwords); this is for scripts and tests
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.bcrypt_rounds)
 security = HTTPBearer(auto_error=False)
 
+token_cache = ExpiringLRU("auth_token", settings.auth_token_cache_size)
+user_cache = ExpiringLRU("auth_user", settings.auth_user_cache_size)
+# Columns kept in the cached user snapshot (no password hash)
+_SNAPSHOT_COLUMNS = ("id", "email", "full_name", "is_active", "created_at", "updated_at")
+
 
 def verify_password(plain: str, hashed: str) -> bool:
     return pwd_context.verify(plain, hashed)
@@ -30,36 +40,65 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
 
 
-def decode_token(token: str) -> Optional[str]:
+def _verify_token(token: str) -> Optional[Tuple[str, float]]:
+    """(user_id, exp) for a valid token. Verified tokens are cached until they expire."""
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached
     try:
         payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
-        return payload.get("sub")
     except JWTError:
         return None
+    user_id = payload.get("sub")
+    if not user_id:
+        return None
+    exp = float(payload.get("exp") or time.time() + settings.auth_user_cache_ttl_seconds)
+    token_cache.set(token, (user_id, exp), exp)
+    return user_id, exp
+
+
+def decode_token(token: str) -> Optional[str]:
+    verified = _verify_token(token)
+    return verified[0] if verified else None
+
+
+def _user_snapshot(user: User) -> dict:
+    return {c: getattr(user, c) for c in _SNAPSHOT_COLUMNS}
 
 
 def get_current_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
     db=Depends(get_db),
 ) -> User:
+    """The authenticated, active user.
+
+    On a cache hit this is a detached copy built from the cached snapshot (column values only,
+    no relationships) and no query is made; otherwise the row is loaded and the snapshot stored
+    until the token expires or AUTH_USER_CACHE_TTL_SECONDS pass, whichever is first.
+    """
     if not credentials:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Not authenticated",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    user_id = decode_token(credentials.credentials)
-    if not user_id:
+    verified = _verify_token(credentials.credentials)
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    user_id, exp = verified
+    snapshot = user_cache.get(user_id)
+    if snapshot is not None:
+        return User(**snapshot)
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     if not user.is_active:
         raise HTTPException(status_code=400, detail="User inactive")
+    user_cache.set(user_id, _user_snapshot(user), min(exp, time.time() + settings.auth_user_cache_ttl_seconds))
     return user
 
 
@@ -73,3 +112,30 @@ def get_current_user_optional(
     if not user_id:
         return None
     return db.query(User).filter(User.id == user_id).first()
+
+
+# session.info key: ids of users changed in the session's current transaction
+_CHANGED_USERS = "auth_changed_user_ids"
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_cached_user(mapper, connection, target: User) -> None:
+    # ORM updates only; a bulk UPDATE on users (or another process) is picked up when the
+    # snapshot's TTL runs out. Dropped now for reads in this transaction, and again after
+    # commit: a concurrent request could re-cache the pre-commit row in between.
+    user_cache.pop(target.id)
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_CHANGED_USERS, set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_users(session: Session) -> None:
+    for user_id in session.info.pop(_CHANGED_USERS, ()):
+        user_cache.pop(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_users(session: Session) -> None:
+    session.info.pop(_CHANGED_USERS, None)
@@ -0,0 +1,78 @@
+"""Benchmark: single-pass ActionsScanner vs the previous regex-based ACTIONS helpers.
+
+Run from backend/:  python -m benchmarks.bench_actions
+"""
+import json
+import re
+import timeit
+
+from services.actions import ActionsScanner, extract_actions
+
+
+def legacy_parse_actions(text: str) -> list:
+    match = re.search(r"ACTIONS:\s*(\[.*\])", text, re.DOTALL)
+    if not match:
+        return []
+    try:
+        return json.loads(match.group(1))
+    except json.JSONDecodeError:
+        return []
+
+
+def legacy_strip_actions(text: str) -> str:
+    return re.sub(r"\s*ACTIONS:\s*\[.*?\]\s*", "", text, flags=re.DOTALL).strip()
+
+
+def make_reply(paragraphs: int, blocks: int = 1, trailing_bracket: bool = False) -> str:
+    action = {
+        "type": "shortlist_add", "name": "University of Toronto [St. George]", "country": "Canada",
+        "domain": "utoronto.ca", "web_page": "https://www.utoronto.ca", "category": "target",
+        "cost_level": "₹19,50,000", "acceptance_chance": "15%",
+        "fit_reason": "Strong CS programs.", "risks": "Competitive admission (15% acceptance).",
+    }
+    para = ("**University of Toronto** offers a strong MS CS track with co-op options; "
+            "expect tuition around ₹19,50,000 per year and a competitive intake. ") * 4
+    parts = [para for _ in range(paragraphs)]
+    for _ in range(blocks):
+        parts.append("ACTIONS: " + json.dumps([action] * 5, ensure_ascii=False))
+    if trailing_bracket:
+        parts.append("Next steps: finish your SOP draft [see todo list].")
+    return "\n\n".join(parts)
+
+
+def bench(label: str, fn, number: int) -> float:
+    secs = min(timeit.repeat(fn, number=number, repeat=5)) / number
+    print(f"  {label:<34} {secs * 1e6:10.1f} µs/reply")
+    return secs
+
+
+def main() -> None:
+    for paragraphs in (10, 200, 2000):
+        reply = make_reply(paragraphs)
+        number = max(1, 2000 // paragraphs)
+        print(f"reply size {len(reply) / 1024:8.1f} KB, 1 block")
+        old = bench("legacy parse + strip (2 scans)", lambda: (legacy_parse_actions(reply), legacy_strip_actions(reply)), number)
+        new = bench("extract_actions (1 scan)", lambda: extract_actions(reply), number)
+
+        def streamed():
+            scanner = ActionsScanner()
+            for i in range(0, len(reply), 64):
+                scanner.feed(reply[i:i + 64])
+            scanner.close()
+        bench("ActionsScanner, 64-char chunks", streamed, number)
+        print(f"  speed-up (whole reply)            {old / new:10.2f}x")
+
+    print("\ncorrectness on awkward replies:")
+    for label, reply in (
+        ("trailing text containing ]", make_reply(3, trailing_bracket=True)),
+        ("two ACTIONS blocks", make_reply(3, blocks=2)),
+    ):
+        text, actions = extract_actions(reply)
+        print(f"  {label}: legacy parsed {len(legacy_parse_actions(reply))} actions, "
+              f"scanner parsed {len(actions)}; "
+              f"legacy strip left ACTIONS text: {'ACTIONS:' in legacy_strip_actions(reply)}, "
+              f"scanner: {'ACTIONS:' in text}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Benchmark: login (bcrypt verify) throughput on the password process pool.
+
+Compares verifying inline on a thread pool (the old path) with services.passwords, and
+reports logins/second and logins/second per worker for each bcrypt cost.
+
+Run from backend/:  python -m benchmarks.bench_passwords [--logins 48] [--rounds 10 12]
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from config import settings
+from services import passwords
+
+PASSWORD = "correct horse battery staple"
+
+
+async def bench_threads(hashed: str, logins: int, rounds: int) -> float:
+    ctx = passwords._context(rounds)
+    loop = asyncio.get_running_loop()
+    start = time.perf_counter()
+    await asyncio.gather(*(loop.run_in_executor(None, ctx.verify, PASSWORD, hashed) for _ in range(logins)))
+    return logins / (time.perf_counter() - start)
+
+
+async def bench_pool(hashed: str, logins: int) -> float:
+    start = time.perf_counter()
+    results = await asyncio.gather(*(passwords.verify_and_rehash(PASSWORD, hashed) for _ in range(logins)))
+    assert all(ok for ok, _ in results)
+    return logins / (time.perf_counter() - start)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=48)
+    parser.add_argument("--rounds", type=int, nargs="+", default=[10, 12])
+    args = parser.parse_args()
+    settings.password_hash_queue_max = max(settings.password_hash_queue_max, args.logins)
+
+    await passwords.start()
+    workers = passwords.stats()["workers"]
+    print(f"{os.cpu_count()} CPUs, {workers} pool workers, {args.logins} concurrent logins")
+    try:
+        for rounds in args.rounds:
+            settings.bcrypt_rounds = rounds
+            hashed = passwords._hash(PASSWORD, rounds)
+            threads = await bench_threads(hashed, args.logins, rounds)
+            pool = await bench_pool(hashed, args.logins)
+            print(f"  cost {rounds:>2}: threadpool {threads:7.1f} logins/s   "
+                  f"process pool {pool:7.1f} logins/s ({pool / workers:6.1f} per worker)")
+
+        # A stored hash at a lower cost is upgraded on login
+        old = passwords._hash(PASSWORD, args.rounds[0])
+        settings.bcrypt_rounds = args.rounds[-1]
+        ok, new_hash = await passwords.verify_and_rehash(PASSWORD, old)
+        print(f"  rehash cost {args.rounds[0]} -> {args.rounds[-1]}: ok={ok} new_hash={new_hash[:7] if new_hash else None}")
+    finally:
+        await passwords.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,68 @@
+"""Benchmark: vectorized recommendation ranking vs scoring candidates one at a time in Python.
+
+Run from backend/:  python -m benchmarks.bench_ranking
+"""
+import math
+import random
+import timeit
+
+from services.ranking import (
+    CATEGORIES, DEFAULT_GPA_SCORE, GPA_WEIGHT, UNDER_BUDGET_DECAY, WEIGHT_ADMIT,
+    WEIGHT_AFFORDABILITY, WEIGHT_COUNTRY, RankingProfile, rank_candidates,
+)
+
+COUNTRIES = ["United States", "United Kingdom", "Canada", "Germany", "Australia", "India"]
+
+
+def make_candidates(n: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    return [
+        {
+            "name": f"University {i}",
+            "country": rng.choice(COUNTRIES),
+            "annual_cost_inr": rng.randrange(200000, 4000000, 50000),
+            "acceptance_pct": rng.randrange(5, 95),
+        }
+        for i in range(n)
+    ]
+
+
+def python_rank(candidates: list, profile: RankingProfile, k: int = 5) -> dict:
+    """Same scoring as services.ranking, written as a per-candidate loop."""
+    preferred = set(profile.preferred_countries)
+    scored = []
+    for i, c in enumerate(candidates):
+        acc = min(max(c["acceptance_pct"] / 100.0, 0.01), 0.99)
+        logit = math.log(acc / (1 - acc)) + GPA_WEIGHT * (profile.gpa_score - DEFAULT_GPA_SCORE)
+        admit = 1 / (1 + math.exp(-logit))
+        afford = 1.0
+        if profile.budget_max:
+            afford *= math.exp(-2.0 * max(c["annual_cost_inr"] - profile.budget_max, 0) / profile.budget_max)
+        if profile.budget_min:
+            under = max(profile.budget_min - c["annual_cost_inr"], 0) / profile.budget_min
+            afford *= math.exp(-UNDER_BUDGET_DECAY * under)
+        fit = WEIGHT_AFFORDABILITY * afford + WEIGHT_COUNTRY * (c["country"] in preferred) + WEIGHT_ADMIT * admit
+        scored.append((admit, i, fit))
+    buckets = {c: [] for c in CATEGORIES}
+    for position, (_, i, fit) in enumerate(sorted(scored)):
+        buckets[CATEGORIES[position * len(CATEGORIES) // len(scored)]].append((-fit, i))
+    return {cat: [candidates[i] for _, i in sorted(b)[:k]] for cat, b in buckets.items()}
+
+
+def main() -> None:
+    profile = RankingProfile(budget_min=1000000, budget_max=2500000, gpa_score=0.82,
+                             preferred_countries=["Canada", "Germany", "United Kingdom"])
+    for n in (100, 1000, 10000, 50000):
+        candidates = make_candidates(n)
+        expected = {cat: [c["name"] for c in recs] for cat, recs in python_rank(candidates, profile).items()}
+        got = {cat: [c["name"] for c in recs] for cat, recs in rank_candidates(candidates, profile).items()}
+        assert got == expected, (got, expected)
+
+        number = max(1, 20000 // n)
+        py = min(timeit.repeat(lambda: python_rank(candidates, profile), number=number, repeat=5)) / number
+        np_ = min(timeit.repeat(lambda: rank_candidates(candidates, profile), number=number, repeat=5)) / number
+        print(f"{n:>6} candidates   python loop {py * 1e3:8.3f} ms   numpy {np_ * 1e3:8.3f} ms   {py / np_:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
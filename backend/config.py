@@ -4,11 +4,73 @@ from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     database_url: str = "postgresql://postgres:password@db:5432/ai_counsellor"
+    # Connection pool per engine (sync and async each get one): steady size, burst overflow, wait
+    database_pool_size: int = 20
+    database_max_overflow: int = 10
+    database_pool_timeout_seconds: float = 10.0
     secret_key: str = "dev-secret-change-in-production"
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 60
-    gemini_api_key: str
+    # Auth fast path: verified tokens cached until exp, active-user snapshots for at most the TTL
+    auth_token_cache_size: int = 10000
+    auth_user_cache_size: int = 10000
+    auth_user_cache_ttl_seconds: float = 60.0
+    # bcrypt cost (existing hashes are upgraded on login); hashing process pool size (0 = CPU count)
+    bcrypt_rounds: int = 12
+    password_hash_workers: int = 0
+    password_hash_queue_max: int = 64
+    # LLM backend: "gemini", or "fake" for offline load tests / benchmarks (no key needed)
+    llm_backend: str = "gemini"
+    gemini_api_key: str = ""
     cors_origins: str = "http://16.171.255.175:3000"
+    # Register the static counsellor prompt as Gemini cached content (falls back to inline when unavailable)
+    gemini_context_cache: bool = True
+    gemini_context_cache_ttl_seconds: int = 3600
+    # Chat history sent to the model: rolling summary + the most recent turns within a token budget
+    chat_history_recent_turns: int = 6
+    chat_history_token_budget: int = 2500
+    chat_summary_max_words: int = 250
+    # LLM admission control (per process): concurrent Gemini calls, bounded wait queue
+    llm_max_concurrency: int = 32
+    llm_max_queue: int = 64
+    llm_queue_timeout_seconds: float = 10.0
+    # Second concurrent chat from the same user: "reject" (409) or "wait" for the first to finish
+    chat_single_flight: str = "reject"
+    # Gemini call deadlines/retries: total budget per request, per-attempt (or per-chunk) timeout
+    llm_request_budget_seconds: float = 40.0
+    llm_attempt_timeout_seconds: float = 20.0
+    llm_max_attempts: int = 3
+    llm_retry_base_delay_seconds: float = 0.5
+    # Circuit breaker: open after N consecutive upstream failures, probe again after reset seconds
+    llm_breaker_failure_threshold: int = 5
+    llm_breaker_reset_seconds: float = 30.0
+    # Background chat jobs (POST /counsellor/jobs): worker tasks per process, queue depth before 503
+    chat_job_workers: int = 8
+    chat_job_queue_max: int = 200
+    chat_job_max_wait_seconds: float = 30.0
+    # University search reads the local catalog; query Hipolabs live when the catalog has no match
+    # (always done while the catalog is still empty)
+    universities_live_fallback: bool = False
+    # /universities/search page size (default and the most a client may ask for)
+    universities_page_size: int = 20
+    universities_max_page_size: int = 100
+    # Search result cache per (country, name): entries, fresh TTL, extra window served stale while refreshing
+    universities_cache_size: int = 512
+    universities_cache_ttl_seconds: float = 600.0
+    universities_cache_stale_seconds: float = 3600.0
+    # Per-country deadline in /universities/recommendations (late countries are reported, not awaited)
+    recommendations_country_timeout_seconds: float = 5.0
+    # Shared outbound HTTP client: pool size, keep-alive, timeouts
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry_seconds: float = 30.0
+    http_connect_timeout_seconds: float = 5.0
+    http_timeout_seconds: float = 15.0
+    # Fake backend: time to first token, gap between streamed chunks, chunk size, ACTIONS JSON array
+    fake_llm_latency_ms: int = 300
+    fake_llm_chunk_interval_ms: int = 30
+    fake_llm_chunk_chars: int = 40
+    fake_llm_actions: str = ""
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,104 @@
+"""Load the university catalog from a Hipolabs JSON dump (or refresh it from the live API).
+
+    python ingest_universities.py world_universities_and_domains.json
+    python ingest_universities.py --from-api
+    python ingest_universities.py --from-api --if-empty   # deploy: seed a fresh database only
+
+The dump is the ``world_universities_and_domains.json`` file from the Hipolabs
+university-domains-list project. Rows are upserted on (name, country), so re-running is safe.
+"""
+import argparse
+import json
+import sys
+import uuid
+from typing import Iterable, List
+
+import httpx
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
+from database import engine
+from models.university import University
+from services.universities import HIPOLABS_URL, normalize_name
+
+BATCH_SIZE = 1000
+
+
+def load_dump(path: str) -> List[dict]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def fetch_from_api() -> List[dict]:
+    # No filters: the API returns the whole dataset (~10k rows)
+    r = httpx.get(HIPOLABS_URL, timeout=httpx.Timeout(120.0))
+    r.raise_for_status()
+    return r.json()
+
+
+def to_rows(records: Iterable[dict]) -> List[dict]:
+    rows = {}
+    for u in records:
+        name = (u.get("name") or "").strip()
+        country = (u.get("country") or "").strip()
+        if not name or not country:
+            continue
+        # The dataset has a few duplicate (name, country) entries; the last one wins
+        rows[(name, country)] = {
+            "id": str(uuid.uuid4()),
+            "name": name,
+            "name_normalized": normalize_name(name),
+            "country": country,
+            "alpha_two_code": (u.get("alpha_two_code") or None),
+            "state_province": (u.get("state-province") or None),
+            "domains": u.get("domains") or [],
+            "web_pages": u.get("web_pages") or [],
+        }
+    return list(rows.values())
+
+
+def catalog_is_empty() -> bool:
+    University.__table__.create(bind=engine, checkfirst=True)
+    with engine.connect() as conn:
+        return conn.execute(select(University.id).limit(1)).first() is None
+
+
+def upsert(rows: List[dict]) -> None:
+    University.__table__.create(bind=engine, checkfirst=True)
+    with engine.begin() as conn:
+        for i in range(0, len(rows), BATCH_SIZE):
+            stmt = insert(University).values(rows[i:i + BATCH_SIZE])
+            stmt = stmt.on_conflict_do_update(
+                constraint="uq_universities_name_country",
+                set_={
+                    "name_normalized": stmt.excluded.name_normalized,
+                    "alpha_two_code": stmt.excluded.alpha_two_code,
+                    "state_province": stmt.excluded.state_province,
+                    "domains": stmt.excluded.domains,
+                    "web_pages": stmt.excluded.web_pages,
+                    "updated_at": stmt.excluded.updated_at,
+                },
+            )
+            conn.execute(stmt)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("path", nargs="?", help="Hipolabs JSON dump")
+    source.add_argument("--from-api", action="store_true", help=f"download the dataset from {HIPOLABS_URL}")
+    parser.add_argument("--if-empty", action="store_true", help="do nothing if the catalog already has rows")
+    args = parser.parse_args(argv)
+
+    if args.if_empty and not catalog_is_empty():
+        print("University catalog already loaded; skipping")
+        return 0
+    records = fetch_from_api() if args.from_api else load_dump(args.path)
+    rows = to_rows(records)
+    upsert(rows)
+    print(f"Loaded {len(rows)} universities ({len(records)} records read)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,19 +1,30 @@
 """AI Counsellor API."""
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
 from config import settings
-from database import engine, Base
+from database import async_engine
 from routers import auth, profile, dashboard, universities, todos, counsellor, applications
+from services import autocomplete, chat_jobs, http, passwords
+from services.counsellor import llm_breaker
+from services.llm_limits import llm_limiter
+from services.metrics import CONTENT_TYPE_LATEST, generate_latest
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    Base.metadata.create_all(bind=engine)
+    # Schema changes are applied by `python migrate.py` before the app starts (see Dockerfile)
+    await http.start()
+    await passwords.start()
+    await autocomplete.load()
+    await chat_jobs.start_workers()
     yield
-    # shutdown if needed
+    await chat_jobs.stop_workers()
+    await http.close()
+    await passwords.close()
+    await async_engine.dispose()
 
 
 app = FastAPI(title="AI Counsellor API", version="0.1.0", lifespan=lifespan)
@@ -23,6 +34,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
 app.include_router(auth.router)
@@ -37,3 +49,27 @@ app.include_router(applications.router)
 @app.get("/health")
 def health():
     return {"status": "ok"}
+
+
+@app.get("/health/llm")
+def health_llm():
+    """LLM circuit breaker and admission state, for monitoring."""
+    breaker = llm_breaker.snapshot()
+    return {
+        "status": "ok" if breaker["state"] == "closed" else "degraded",
+        "breaker": breaker,
+        "limiter": llm_limiter.stats,
+        "chat_job_queue_depth": chat_jobs.queue_depth(),
+    }
+
+
+@app.get("/health/http")
+def health_http():
+    """Shared outbound HTTP client pool usage."""
+    return {"status": "ok", "pool": http.pool_stats()}
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus scrape endpoint (per-stage chat latency histograms, token counts)."""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
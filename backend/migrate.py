@@ -0,0 +1,128 @@
+"""Versioned schema migrations.
+
+    python migrate.py             # apply pending migrations (same as `upgrade`)
+    python migrate.py status      # list applied and pending migrations
+
+Migrations live in migrations/ as ``NNNN_description.sql`` or ``NNNN_description.py`` (defining
+``upgrade(conn)``) and run in version order, each in its own transaction, recorded in the
+``schema_migrations`` table. A Postgres advisory lock serializes concurrent runners (e.g.
+several containers starting at once). Files must be safe to re-run on databases that predate
+this runner (IF NOT EXISTS, guarded blocks).
+"""
+import argparse
+import importlib.util
+import re
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from database import engine
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent / "migrations"
+_FILENAME = re.compile(r"^(\d{4})_[\w-]+\.(sql|py)$")
+# Arbitrary constant shared by all runners for pg_advisory_lock
+_LOCK_ID = 0x5C4E_0A11
+
+
+@dataclass
+class Migration:
+    version: str
+    path: Path
+
+    @property
+    def name(self) -> str:
+        return self.path.name
+
+
+def discover() -> List[Migration]:
+    found = {}
+    for path in sorted(MIGRATIONS_DIR.iterdir()):
+        match = _FILENAME.match(path.name)
+        if not match:
+            continue
+        version = match.group(1)
+        if version in found:
+            raise RuntimeError(f"Duplicate migration version {version}: {found[version].name}, {path.name}")
+        found[version] = Migration(version, path)
+    return [found[v] for v in sorted(found)]
+
+
+def _ensure_version_table(conn: Connection) -> None:
+    conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS schema_migrations ("
+        " version varchar(16) PRIMARY KEY,"
+        " name varchar(255) NOT NULL,"
+        " applied_at timestamptz NOT NULL DEFAULT now())"
+    ))
+
+
+def _applied(conn: Connection) -> set:
+    return set(conn.execute(text("SELECT version FROM schema_migrations")).scalars())
+
+
+def _apply(conn: Connection, migration: Migration) -> None:
+    if migration.path.suffix == ".sql":
+        # Raw DBAPI cursor: the file may contain several statements, DO blocks and literal %
+        with conn.connection.cursor() as cur:
+            cur.execute(migration.path.read_text(encoding="utf-8"))
+    else:
+        spec = importlib.util.spec_from_file_location(f"migrations.m{migration.version}", migration.path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        module.upgrade(conn)
+    conn.execute(
+        text("INSERT INTO schema_migrations (version, name) VALUES (:v, :n)"),
+        {"v": migration.version, "n": migration.name},
+    )
+
+
+def upgrade() -> int:
+    """Apply pending migrations; returns how many ran."""
+    migrations = discover()
+    ran = 0
+    with engine.connect() as lock_conn:
+        # Session-level lock on a separate connection, held while each migration commits
+        lock_conn.execute(text("SELECT pg_advisory_lock(:id)"), {"id": _LOCK_ID})
+        try:
+            with engine.begin() as conn:
+                _ensure_version_table(conn)
+            with engine.connect() as conn:
+                applied = _applied(conn)
+            for migration in migrations:
+                if migration.version in applied:
+                    continue
+                print(f"Applying {migration.name} ...")
+                with engine.begin() as conn:
+                    _apply(conn, migration)
+                ran += 1
+        finally:
+            lock_conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": _LOCK_ID})
+    print(f"Applied {ran} migration(s); schema is up to date." if ran else "Schema is up to date.")
+    return ran
+
+
+def status() -> None:
+    with engine.begin() as conn:
+        _ensure_version_table(conn)
+        applied = _applied(conn)
+    for migration in discover():
+        print(f"  [{'x' if migration.version in applied else ' '}] {migration.name}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", nargs="?", default="upgrade", choices=["upgrade", "status"])
+    args = parser.parse_args(argv)
+    if args.command == "status":
+        status()
+    else:
+        upgrade()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+-- Migration: Base schema, frozen as the tables and indexes create_all produced at startup before
+-- the migration runner existed. Never edit this file to follow the models: every later schema
+-- change is its own migration, so fresh and existing databases go through the same steps.
+-- IF NOT EXISTS makes it a no-op on databases created before the runner.
+
+CREATE TABLE IF NOT EXISTS users (
+  id VARCHAR(36) NOT NULL,
+  email VARCHAR(255) NOT NULL,
+  hashed_password VARCHAR(255) NOT NULL,
+  full_name VARCHAR(255) NOT NULL,
+  is_active BOOLEAN,
+  created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+  updated_at TIMESTAMP WITH TIME ZONE,
+  PRIMARY KEY (id)
+);
+CREATE UNIQUE INDEX IF NOT EXISTS ix_users_email ON users (email);
+CREATE INDEX IF NOT EXISTS ix_users_id ON users (id);
+
+CREATE TABLE IF NOT EXISTS chat_messages (
+  id VARCHAR(36) NOT NULL,
+  user_id VARCHAR(36) NOT NULL,
+  role VARCHAR(20) NOT NULL,
+  content TEXT NOT NULL,
+  actions JSON,
+  created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+  PRIMARY KEY (id),
+  FOREIGN KEY(user_id) REFERENCES users (id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS ix_chat_messages_id ON chat_messages (id);
+
+CREATE TABLE IF NOT EXISTS profiles (
+  id VARCHAR(36) NOT NULL,
+  user_id VARCHAR(36) NOT NULL,
+  onboarding_complete BOOLEAN,
+  current_education_level VARCHAR(100),
+  degree_major VARCHAR(255),
+  graduation_year INTEGER,
+  gpa VARCHAR(50),
+  intended_degree VARCHAR(100),
+  field_of_study VARCHAR(255),
+  target_intake_year INTEGER,
+  preferred_countries JSON,
+  budget_min INTEGER,
+  budget_max INTEGER,
+  funding_plan VARCHAR(100),
+  exams JSON,
+  sop_status VARCHAR(50),
+  strength_academics VARCHAR(50),
+  strength_exams VARCHAR(50),
+  strength_sop VARCHAR(50),
+  created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+  updated_at TIMESTAMP WITH TIME ZONE,
+  PRIMARY KEY (id),
+  UNIQUE (user_id),
+  FOREIGN KEY(user_id) REFERENCES users (id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS ix_profiles_id ON profiles (id);
+
+CREATE TABLE IF NOT EXISTS university_shortlists (
+  id VARCHAR(36) NOT NULL,
+  user_id VARCHAR(36) NOT NULL,
+  name VARCHAR(500) NOT NULL,
+  country VARCHAR(100) NOT NULL,
+  domain VARCHAR(255),
+  web_page TEXT,
+  category VARCHAR(50),
+  cost_level VARCHAR(50),
+  acceptance_chance VARCHAR(50),
+  fit_reason TEXT,
+  risks TEXT,
+  locked BOOLEAN,
+  created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+  PRIMARY KEY (id),
+  FOREIGN KEY(user_id) REFERENCES users (id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS ix_university_shortlists_id ON university_shortlists (id);
+
+CREATE TABLE IF NOT EXISTS todos (
+  id VARCHAR(36) NOT NULL,
+  user_id VARCHAR(36) NOT NULL,
+  shortlist_id VARCHAR(36),
+  title VARCHAR(500) NOT NULL,
+  description TEXT,
+  completed BOOLEAN,
+  category VARCHAR(100),
+  created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+  updated_at TIMESTAMP WITH TIME ZONE,
+  PRIMARY KEY (id),
+  FOREIGN KEY(user_id) REFERENCES users (id) ON DELETE CASCADE,
+  FOREIGN KEY(shortlist_id) REFERENCES university_shortlists (id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS ix_todos_id ON todos (id);
@@ -1,26 +1,39 @@
 -- Migration: Add `exams` JSONB column and convert existing exam/status string columns into exams array.
 -- WARNING: Review before running in production and backup your DB.
-
-BEGIN;
+-- Applied by `python migrate.py`, which runs it in a single transaction.
 
 -- 1) Add new column
 ALTER TABLE profiles
   ADD COLUMN IF NOT EXISTS exams JSONB;
 
 -- 2) Migrate existing exam enum/text columns into the new exams JSONB array
--- This assumes columns `ielts_toefl_status` and `gre_gmat_status` exist. They will be cast to text.
-UPDATE profiles
-SET exams = (
-  SELECT jsonb_agg(x) FROM (
-    SELECT * FROM (
-      VALUES
-        (CASE WHEN ielts_toefl_status IS NOT NULL THEN jsonb_build_object('name', 'IELTS/TOEFL', 'status', ielts_toefl_status::text) ELSE NULL END),
-        (CASE WHEN gre_gmat_status IS NOT NULL THEN jsonb_build_object('name', 'GRE/GMAT', 'status', gre_gmat_status::text) ELSE NULL END)
-    ) AS vals(obj)
-    WHERE obj IS NOT NULL
-  ) AS t(x)
-)
-WHERE exams IS NULL;
+-- Only on databases that still have the legacy `ielts_toefl_status` and `gre_gmat_status` columns.
+DO $$
+BEGIN
+  IF EXISTS (
+    SELECT 1 FROM information_schema.columns
+    WHERE table_schema = current_schema() AND table_name = 'profiles' AND column_name = 'ielts_toefl_status'
+  ) AND EXISTS (
+    SELECT 1 FROM information_schema.columns
+    WHERE table_schema = current_schema() AND table_name = 'profiles' AND column_name = 'gre_gmat_status'
+  ) THEN
+    EXECUTE $sql$
+      UPDATE profiles
+      SET exams = (
+        SELECT jsonb_agg(x) FROM (
+          SELECT * FROM (
+            VALUES
+              (CASE WHEN ielts_toefl_status IS NOT NULL THEN jsonb_build_object('name', 'IELTS/TOEFL', 'status', ielts_toefl_status::text) ELSE NULL END),
+              (CASE WHEN gre_gmat_status IS NOT NULL THEN jsonb_build_object('name', 'GRE/GMAT', 'status', gre_gmat_status::text) ELSE NULL END)
+          ) AS vals(obj)
+          WHERE obj IS NOT NULL
+        ) AS t(x)
+      )
+      WHERE exams IS NULL
+    $sql$;
+  END IF;
+END
+$$;
 
 -- 3) Convert graduation_year and target_intake_year to integer if they are stored as text
 -- Use USING to cast existing string values to integer, safely handling empty strings.
@@ -36,13 +49,3 @@ ALTER TABLE profiles
 -- 5) Optionally drop the old exam status columns if you are confident data has been migrated
 -- DROP COLUMN ielts_toefl_status;
 -- DROP COLUMN gre_gmat_status;
-
-COMMIT;
-
--- Alembic hint:
--- If you're using Alembic, create a new revision and in the `upgrade()`:
--- 1) op.add_column('profiles', sa.Column('exams', postgresql.JSONB(), nullable=True))
--- 2) run a small SQL to migrate values from old columns into exams (op.execute(...))
--- 3) use op.alter_column to change column types for graduation_year/target_intake_year/budget_min/budget_max
--- 4) optionally drop old columns
--- Always test locally on a copy of your DB before running in production.
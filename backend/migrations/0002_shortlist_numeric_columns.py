@@ -0,0 +1,51 @@
+"""Add numeric annual_cost_inr / acceptance_pct columns to university_shortlists and index them.
+
+Existing rows are backfilled from the free-text cost_level / acceptance_chance strings with the
+same parsers the app uses on write (services.amounts).
+"""
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from services.amounts import parse_acceptance_pct, parse_cost_inr
+
+BATCH_SIZE = 500
+
+
+def upgrade(conn: Connection) -> None:
+    conn.execute(text(
+        "ALTER TABLE university_shortlists"
+        " ADD COLUMN IF NOT EXISTS annual_cost_inr integer,"
+        " ADD COLUMN IF NOT EXISTS acceptance_pct double precision"
+    ))
+
+    rows = conn.execute(text(
+        "SELECT id, cost_level, acceptance_chance, annual_cost_inr, acceptance_pct FROM university_shortlists"
+        " WHERE (annual_cost_inr IS NULL AND cost_level IS NOT NULL)"
+        " OR (acceptance_pct IS NULL AND acceptance_chance IS NOT NULL)"
+    )).mappings().all()
+    update = text(
+        "UPDATE university_shortlists SET annual_cost_inr = :cost, acceptance_pct = :acceptance WHERE id = :sid"
+    )
+    params = [
+        {
+            "sid": r["id"],
+            "cost": r["annual_cost_inr"] if r["annual_cost_inr"] is not None else parse_cost_inr(r["cost_level"]),
+            "acceptance": (
+                r["acceptance_pct"] if r["acceptance_pct"] is not None
+                else parse_acceptance_pct(r["acceptance_chance"])
+            ),
+        }
+        for r in rows
+    ]
+    for i in range(0, len(params), BATCH_SIZE):
+        conn.execute(update, params[i:i + BATCH_SIZE])
+
+    # Per-user filtering and sorting
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_university_shortlists_user_cost"
+        " ON university_shortlists (user_id, annual_cost_inr)"
+    ))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_university_shortlists_user_acceptance"
+        " ON university_shortlists (user_id, acceptance_pct)"
+    ))
@@ -0,0 +1,15 @@
+-- Migration: Composite indexes for the per-user queries on the hot paths.
+--   chat_messages (user_id, created_at): chat history, recent turns, summary folding
+--   todos (user_id, created_at): todo list and dashboard counts
+--   university_shortlists (user_id, locked): shortlist listing (locked first) and stage checks
+-- Plain CREATE INDEX (the runner wraps each migration in a transaction, which rules out
+-- CONCURRENTLY); these tables are small enough that the brief write lock is acceptable.
+
+CREATE INDEX IF NOT EXISTS ix_chat_messages_user_created
+  ON chat_messages (user_id, created_at);
+
+CREATE INDEX IF NOT EXISTS ix_todos_user_created
+  ON todos (user_id, created_at);
+
+CREATE INDEX IF NOT EXISTS ix_university_shortlists_user_locked
+  ON university_shortlists (user_id, locked);
@@ -0,0 +1,31 @@
+"""Backfill strength_academics / strength_exams / strength_sop, now computed when the profile is written.
+
+Until now they were only filled in by GET /dashboard, so profiles that never loaded it have NULLs.
+"""
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from services.profile_strength import strength_academics, strength_exams, strength_sop
+
+BATCH_SIZE = 500
+
+
+def upgrade(conn: Connection) -> None:
+    rows = conn.execute(text(
+        "SELECT id, gpa, degree_major, exams, sop_status FROM profiles"
+    )).mappings().all()
+    update = text(
+        "UPDATE profiles SET strength_academics = :academics, strength_exams = :exams, strength_sop = :sop "
+        "WHERE id = :pid"
+    )
+    params = [
+        {
+            "pid": r["id"],
+            "academics": strength_academics(r["gpa"], r["degree_major"]),
+            "exams": strength_exams(r["exams"]),
+            "sop": strength_sop(r["sop_status"]),
+        }
+        for r in rows
+    ]
+    for i in range(0, len(params), BATCH_SIZE):
+        conn.execute(update, params[i:i + BATCH_SIZE])
@@ -0,0 +1,5 @@
+-- Migration: Per-user data version, bumped by every write to a user's data and used to
+-- build ETags on the read endpoints (services/versioning.py).
+
+ALTER TABLE users
+  ADD COLUMN IF NOT EXISTS data_version integer NOT NULL DEFAULT 0;
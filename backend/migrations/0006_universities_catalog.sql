@@ -0,0 +1,28 @@
+-- Migration: Local university catalog (models.University), loaded by ingest_universities.py.
+-- Search matches the normalized name anywhere (LIKE '%needle%'), which a btree can't serve; a
+-- pg_trgm GIN index serves unanchored LIKE for needles of three or more characters. Databases
+-- where the catalog was created with a text_pattern_ops btree get the trigram index instead.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE TABLE IF NOT EXISTS universities (
+  id VARCHAR(36) NOT NULL,
+  name VARCHAR(500) NOT NULL,
+  name_normalized VARCHAR(500) NOT NULL,
+  country VARCHAR(100) NOT NULL,
+  alpha_two_code VARCHAR(2),
+  state_province VARCHAR(255),
+  domains JSON,
+  web_pages JSON,
+  updated_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+  PRIMARY KEY (id),
+  CONSTRAINT uq_universities_name_country UNIQUE (name, country)
+);
+
+CREATE INDEX IF NOT EXISTS ix_universities_country_name
+  ON universities (country, name_normalized);
+
+DROP INDEX IF EXISTS ix_universities_name_normalized;
+
+CREATE INDEX IF NOT EXISTS ix_universities_name_trgm
+  ON universities USING gin (name_normalized gin_trgm_ops);
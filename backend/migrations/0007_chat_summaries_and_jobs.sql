@@ -0,0 +1,28 @@
+-- Migration: Tables for the rolling chat summary (services/chat_history.py) and background chat
+-- jobs (services/chat_jobs.py).
+
+CREATE TABLE IF NOT EXISTS chat_summaries (
+  user_id VARCHAR(36) NOT NULL,
+  summary TEXT NOT NULL DEFAULT '',
+  summarized_until TIMESTAMP WITH TIME ZONE,
+  updated_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+  PRIMARY KEY (user_id),
+  FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS chat_jobs (
+  id VARCHAR(36) NOT NULL,
+  user_id VARCHAR(36) NOT NULL,
+  message_id VARCHAR(36) NOT NULL,
+  status VARCHAR(20) NOT NULL DEFAULT 'queued',
+  result JSON,
+  error TEXT,
+  created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+  updated_at TIMESTAMP WITH TIME ZONE,
+  PRIMARY KEY (id),
+  FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE,
+  FOREIGN KEY (message_id) REFERENCES chat_messages (id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS ix_chat_jobs_id ON chat_jobs (id);
+CREATE INDEX IF NOT EXISTS ix_chat_jobs_user_id ON chat_jobs (user_id);
@@ -1,7 +1,7 @@
 from .user import User
 from .profile import Profile
-from .university import UniversityShortlist
+from .university import UniversityShortlist, University
 from .todo import Todo
-from .chat import ChatMessage
+from .chat import ChatMessage, ChatSummary, ChatJob
 
-__all__ = ["User", "Profile", "UniversityShortlist", "Todo", "ChatMessage"]
+__all__ = ["User", "Profile", "UniversityShortlist", "University", "Todo", "ChatMessage", "ChatSummary", "ChatJob"]
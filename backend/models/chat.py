@@ -1,5 +1,5 @@
 """Chat messages for AI Counsellor."""
-from sqlalchemy import Column, DateTime, String, Text, Boolean, ForeignKey, JSON
+from sqlalchemy import Column, DateTime, String, Text, Boolean, ForeignKey, JSON, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -18,3 +18,33 @@ class ChatMessage(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     user = relationship("User", back_populates="chat_messages")
+
+    __table_args__ = (
+        Index("ix_chat_messages_user_created", "user_id", "created_at"),
+    )
+
+
+class ChatSummary(Base):
+    """Rolling summary of a user's older chat turns (everything up to summarized_until)."""
+    __tablename__ = "chat_summaries"
+
+    user_id = Column(String(36), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    summary = Column(Text, nullable=False, default="")
+    # created_at of the newest message folded into the summary
+    summarized_until = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class ChatJob(Base):
+    """Counsellor reply generated in the background (POST /counsellor/jobs)."""
+    __tablename__ = "chat_jobs"
+
+    id = Column(String(36), primary_key=True, index=True)
+    user_id = Column(String(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    message_id = Column(String(36), ForeignKey("chat_messages.id", ondelete="CASCADE"), nullable=False)
+    status = Column(String(20), nullable=False, default="queued")  # queued / running / done / failed
+    # {"message": ..., "actions": [...]} once done
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
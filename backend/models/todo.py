@@ -1,5 +1,5 @@
 """To-do tasks (AI-generated and user)."""
-from sqlalchemy import Column, DateTime, String, Boolean, ForeignKey, Text
+from sqlalchemy import Column, DateTime, String, Boolean, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -21,3 +21,7 @@ class Todo(Base):
 
     user = relationship("User", back_populates="todos")
     shortlist = relationship("UniversityShortlist", back_populates="todos")
+
+    __table_args__ = (
+        Index("ix_todos_user_created", "user_id", "created_at"),
+    )
@@ -1,5 +1,5 @@
-"""University shortlist and lock."""
-from sqlalchemy import Column, DateTime, String, Boolean, ForeignKey, Text
+"""University shortlist and lock, and the local university catalog."""
+from sqlalchemy import Column, DDL, DateTime, String, Boolean, ForeignKey, Text, JSON, Index, UniqueConstraint, Integer, Float, event
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -20,6 +20,9 @@ class UniversityShortlist(Base):
     category = Column(String(50), nullable=True)  # dream / target / safe
     cost_level = Column(String(50), nullable=True)  # low / medium / high
     acceptance_chance = Column(String(50), nullable=True)  # low / medium / high
+    # Parsed from cost_level / acceptance_chance at write time (services.amounts), for SQL filters
+    annual_cost_inr = Column(Integer, nullable=True)
+    acceptance_pct = Column(Float, nullable=True)
     fit_reason = Column(Text, nullable=True)
     risks = Column(Text, nullable=True)
     locked = Column(Boolean, default=False)
@@ -27,3 +30,46 @@ class UniversityShortlist(Base):
 
     user = relationship("User", back_populates="shortlists")
     todos = relationship("Todo", back_populates="shortlist")
+
+    __table_args__ = (
+        Index("ix_university_shortlists_user_locked", "user_id", "locked"),
+        Index("ix_university_shortlists_user_cost", "user_id", "annual_cost_inr"),
+        Index("ix_university_shortlists_user_acceptance", "user_id", "acceptance_pct"),
+    )
+
+
+class University(Base):
+    """World university catalog (Hipolabs dataset), loaded by ingest_universities.py and searched locally."""
+    __tablename__ = "universities"
+
+    id = Column(String(36), primary_key=True)
+    name = Column(String(500), nullable=False)
+    # Lower-cased, diacritics folded, punctuation collapsed (services.universities.normalize_name)
+    name_normalized = Column(String(500), nullable=False)
+    country = Column(String(100), nullable=False)
+    alpha_two_code = Column(String(2), nullable=True)
+    state_province = Column(String(255), nullable=True)
+    domains = Column(JSON, nullable=True)
+    web_pages = Column(JSON, nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("name", "country", name="uq_universities_name_country"),
+        # Country-scoped search ordered by name
+        Index("ix_universities_country_name", "country", "name_normalized"),
+        # Substring search (LIKE '%needle%') on the normalized name; trigrams serve needles of 3+ chars
+        Index(
+            "ix_universities_name_trgm",
+            "name_normalized",
+            postgresql_using="gin",
+            postgresql_ops={"name_normalized": "gin_trgm_ops"},
+        ),
+    )
+
+
+# gin_trgm_ops needs pg_trgm; create it ahead of the table on fresh databases
+event.listen(
+    University.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
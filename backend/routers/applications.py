@@ -1,5 +1,5 @@
 """Application guidance (unlocked after at least one university locked)."""
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 
 from database import get_db
@@ -7,15 +7,21 @@ from models.user import User
 from models.university import UniversityShortlist
 from models.todo import Todo
 from auth import get_current_user
+from services.versioning import conditional_get
 
 router = APIRouter(prefix="/applications", tags=["applications"])
 
 
 @router.get("")
 def get_application_guidance(
+    request: Request,
+    response: Response,
     user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
+    not_modified = conditional_get(request, response, "applications", db, user.id)
+    if not_modified:
+        return not_modified
     locked = db.query(UniversityShortlist).filter(
         UniversityShortlist.user_id == user.id,
         UniversityShortlist.locked == True,
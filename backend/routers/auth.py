@@ -1,33 +1,45 @@
 """Signup and login."""
 import uuid
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from database import get_db
+from database import get_async_db
 from models.user import User
 from models.profile import Profile
 from schemas.auth import UserCreate, UserLogin, Token, UserResponse
-from auth import get_password_hash, create_access_token, get_current_user
+from auth import create_access_token, get_current_user
+from services import passwords
+from services.profile_strength import apply_strengths
 from config import settings
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
+async def _pool_call(coro):
+    """Await a password-pool call, turning a full queue into 503 + Retry-After."""
+    try:
+        return await coro
+    except passwords.PasswordPoolBusy as e:
+        raise HTTPException(status_code=503, detail=e.detail, headers={"Retry-After": str(e.retry_after)})
+
+
 @router.post("/signup", response_model=Token)
-def signup(data: UserCreate, db: Session = Depends(get_db)):
-    if db.query(User).filter(User.email == data.email).first():
+async def signup(data: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    if (await db.execute(select(User.id).where(User.email == data.email))).first():
         raise HTTPException(status_code=400, detail="Email already registered")
     user = User(
         id=str(uuid.uuid4()),
         email=data.email,
-        hashed_password=get_password_hash(data.password),
+        hashed_password=await _pool_call(passwords.hash_password(data.password)),
         full_name=data.full_name,
+        is_active=True,
     )
     db.add(user)
     profile = Profile(id=str(uuid.uuid4()), user_id=user.id)
+    apply_strengths(profile)
     db.add(profile)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
     access_token = create_access_token(data={"sub": user.id})
     return Token(
         access_token=access_token,
@@ -36,11 +48,17 @@ def signup(data: UserCreate, db: Session = Depends(get_db)):
 
 
 @router.post("/login", response_model=Token)
-def login(data: UserLogin, db: Session = Depends(get_db)):
-    from auth import verify_password
-    user = db.query(User).filter(User.email == data.email).first()
-    if not user or not verify_password(data.password, user.hashed_password):
+async def login(data: UserLogin, db: AsyncSession = Depends(get_async_db)):
+    user = (await db.execute(select(User).where(User.email == data.email))).scalar_one_or_none()
+    if not user:
+        raise HTTPException(status_code=401, detail="Incorrect email or password")
+    ok, new_hash = await _pool_call(passwords.verify_and_rehash(data.password, user.hashed_password))
+    if not ok:
         raise HTTPException(status_code=401, detail="Incorrect email or password")
+    if new_hash:
+        # Stored hash used a different bcrypt cost (or scheme); upgrade it transparently
+        user.hashed_password = new_hash
+        await db.commit()
     access_token = create_access_token(data={"sub": user.id})
     return Token(
         access_token=access_token,
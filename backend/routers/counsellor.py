@@ -1,23 +1,59 @@
 """AI Counsellor chat and action execution."""
+import json
+import time
 import uuid
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime, timezone
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from database import get_db
+from config import settings
+from database import get_db, get_async_db
 from models.user import User
-from models.profile import Profile
-from models.university import UniversityShortlist
-from models.todo import Todo
-from models.chat import ChatMessage
+from models.chat import ChatJob, ChatMessage
 from auth import get_current_user
-from schemas.chat import ChatMessageCreate, ChatMessageResponse, CounsellorResponse
-from services.counsellor import invoke_counsellor
+from schemas.chat import ChatJobResponse, ChatMessageCreate, ChatMessageResponse, CounsellorResponse
+from services import chat_jobs
+from services.actions import ActionsScanner
+from services.counsellor import (
+    invoke_counsellor,
+    load_chat_context,
+    refresh_conversation_summary,
+    save_turn,
+    stream_counsellor,
+)
+from services.llm_limits import LLMLimitExceeded, LLMSlot, llm_limiter
+from services.metrics import stage_timer
+from services.versioning import bump_data_version_async, conditional_get
 
 router = APIRouter(prefix="/counsellor", tags=["counsellor"])
 
+CHAT_ROUTE = "/counsellor/chat"
+STREAM_ROUTE = "/counsellor/chat/stream"
+
+
+async def _admit(user_id: str) -> LLMSlot:
+    try:
+        return await llm_limiter.acquire(user_id)
+    except LLMLimitExceeded as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail, headers={"Retry-After": str(e.retry_after)})
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
 
 @router.get("/history", response_model=list[ChatMessageResponse])
-def history(user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def history(
+    request: Request,
+    response: Response,
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    not_modified = conditional_get(request, response, "history", db, user.id)
+    if not_modified:
+        return not_modified
     rows = (
         db.query(ChatMessage)
         .filter(ChatMessage.user_id == user.id)
@@ -28,103 +64,143 @@ def history(user: User = Depends(get_current_user), db: Session = Depends(get_db
 
 
 @router.post("/chat", response_model=CounsellorResponse)
-def chat(
+async def chat(
     body: ChatMessageCreate,
+    background_tasks: BackgroundTasks,
     user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    profile = db.query(Profile).filter(Profile.user_id == user.id).first()
-    shortlists = db.query(UniversityShortlist).filter(UniversityShortlist.user_id == user.id).all()
+    sent_at = datetime.now(timezone.utc)
+    with stage_timer(CHAT_ROUTE, "total"):
+        with stage_timer(CHAT_ROUTE, "context_query"):
+            profile, shortlists = await load_chat_context(db, user.id)
 
-    # Save user message
-    user_msg = ChatMessage(
-        id=str(uuid.uuid4()),
-        user_id=user.id,
-        role="user",
-        content=body.content,
-    )
-    db.add(user_msg)
-    db.commit()
-
-    # Get AI response and actions
-    response_text, actions = invoke_counsellor(db, user.id, body.content, profile, shortlists)
-    print(f"[DEBUG] Actions returned from AI: {actions}")
-
-    # Execute actions
-    executed = []
-    for a in actions:
-        t = a.get("type")
-        print(f"[DEBUG] Executing action type: {t}, data: {a}")
-        if t == "shortlist_add":
-            name = a.get("name") or "Unknown"
-            country = a.get("country") or "Unknown"
-            # Extract all fields with defaults
-            domain = a.get("domain")
-            category = a.get("category") or "target"  # default to target if not specified
-            cost_level = a.get("cost_level")
-            acceptance_chance = a.get("acceptance_chance")
-            fit_reason = a.get("fit_reason") or f"Recommended for {country}"
-            risks = a.get("risks") or "Standard competitive admission"
-            
-            print(f"[DEBUG] Adding university: name={name}, country={country}, domain={domain}, category={category}, cost={cost_level}, acceptance={acceptance_chance}")
-            
-            rec = UniversityShortlist(
-                id=str(uuid.uuid4()),
-                user_id=user.id,
-                name=name,
-                country=country,
-                domain=domain,
-                web_page=a.get("web_page"),  # Include web_page if provided
-                category=category,
-                cost_level=cost_level,
-                acceptance_chance=acceptance_chance,
-                fit_reason=fit_reason,
-                risks=risks,
+        # One generation per user at a time, bounded globally
+        with stage_timer(CHAT_ROUTE, "admission_wait"):
+            slot = await _admit(user.id)
+        try:
+            # Get AI response and actions
+            response_text, actions = await invoke_counsellor(
+                db, user.id, body.content, profile, shortlists, route=CHAT_ROUTE,
             )
-            db.add(rec)
-            executed.append({"type": "shortlist_add", "name": name, "country": country, "category": category})
-            print(f"[DEBUG] University queued for DB save: fit_reason={fit_reason}, risks={risks}, domain={domain}")
-        elif t == "todo_add":
-            title = a.get("title") or "Task"
-            shortlist_id = a.get("shortlist_id")
-            # Validate shortlist_id belongs to user if provided
-            if shortlist_id:
-                shortlist_check = db.query(UniversityShortlist).filter(
-                    UniversityShortlist.id == shortlist_id,
-                    UniversityShortlist.user_id == user.id,
-                ).first()
-                if not shortlist_check:
-                    shortlist_id = None  # Discard invalid shortlist_id
-            todo = Todo(
-                id=str(uuid.uuid4()),
-                user_id=user.id,
-                shortlist_id=shortlist_id,
-                title=title,
-                category=a.get("category"),
+            print(f"[DEBUG] Actions returned from AI: {actions}")
+
+            # Both messages and all actions in one transaction
+            await save_turn(
+                db, user.id, body.content, sent_at, response_text, actions, {s.id for s in shortlists},
+                route=CHAT_ROUTE,
             )
-            db.add(todo)
-            executed.append({"type": "todo_add", "title": title, "shortlist_id": shortlist_id})
-        elif t == "lock" and a.get("shortlist_id"):
-            rec = db.query(UniversityShortlist).filter(
-                UniversityShortlist.id == a["shortlist_id"],
-                UniversityShortlist.user_id == user.id,
-            ).first()
-            if rec:
-                rec.locked = True
-                executed.append({"type": "lock", "shortlist_id": rec.id})
-
-    db.commit()
-    print(f"[DEBUG] All actions committed to DB. Executed: {executed}")
-
-    # Save assistant message with full action details for frontend
-    assistant_msg = ChatMessage(
+        finally:
+            slot.release()
+    # Fold turns that left the recent window into the rolling summary, after the response is sent
+    background_tasks.add_task(refresh_conversation_summary, user.id)
+
+    return CounsellorResponse(message=response_text, actions=actions if actions else None)  # Return full actions
+
+
+@router.post("/chat/stream")
+async def chat_stream(
+    body: ChatMessageCreate,
+    background_tasks: BackgroundTasks,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Server-Sent-Events variant of /chat.
+
+    Emits ``delta`` events with reply text as Gemini produces it. The ACTIONS block is held
+    back; once the stream ends the turn is saved and a single ``done`` event carries
+    the cleaned message and the full actions, same shape as the /chat response.
+    """
+    user_id = user.id
+    sent_at = datetime.now(timezone.utc)
+    with stage_timer(STREAM_ROUTE, "context_query"):
+        profile, shortlists = await load_chat_context(db, user_id)
+
+    # Admission happens before the 200 is sent so a rejection is still a proper 409/429/503
+    with stage_timer(STREAM_ROUTE, "admission_wait"):
+        slot = await _admit(user_id)
+    background_tasks.add_task(slot.release)  # in case the stream is never iterated (client gone)
+    chunks = stream_counsellor(db, user_id, body.content, profile, shortlists, route=STREAM_ROUTE)
+    # Runs once the stream has finished
+    background_tasks.add_task(refresh_conversation_summary, user_id)
+
+    async def events():
+        try:
+            scanner = ActionsScanner()
+            async for chunk in chunks:
+                text = scanner.feed(chunk)
+                if text:
+                    yield _sse("delta", {"text": text})
+            text = scanner.close()
+            if text:
+                yield _sse("delta", {"text": text})
+
+            response_text, actions = scanner.text, scanner.actions
+            await save_turn(
+                db, user_id, body.content, sent_at, response_text, actions, {s.id for s in shortlists},
+                route=STREAM_ROUTE,
+            )
+
+            done = CounsellorResponse(message=response_text, actions=actions if actions else None)
+            yield _sse("done", done.model_dump())
+        finally:
+            slot.release()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/jobs", response_model=ChatJobResponse, status_code=202)
+async def create_chat_job(
+    body: ChatMessageCreate,
+    response: Response,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Queue a counsellor reply and return at once; fetch it from GET /counsellor/jobs/{id}."""
+    if chat_jobs.is_saturated():
+        raise HTTPException(
+            status_code=503,
+            detail="The counsellor is busy right now. Please retry shortly.",
+            headers={"Retry-After": "5"},
+        )
+    message = ChatMessage(
         id=str(uuid.uuid4()),
         user_id=user.id,
-        role="assistant",
-        content=response_text,
-        actions=actions if actions else None,  # Store full actions with all details
+        role="user",
+        content=body.content,
+        created_at=datetime.now(timezone.utc),
     )
-    db.add(assistant_msg)
-    db.commit()
+    job = ChatJob(id=str(uuid.uuid4()), user_id=user.id, message_id=message.id, status="queued")
+    db.add_all([message, job])
+    await bump_data_version_async(db, user.id)
+    await db.commit()
+    chat_jobs.enqueue(job.id)
+    response.headers["Location"] = f"/counsellor/jobs/{job.id}"
+    return job
 
-    return CounsellorResponse(message=response_text, actions=actions if actions else None)  # Return full actions
+
+@router.get("/jobs/{job_id}", response_model=ChatJobResponse)
+async def get_chat_job(
+    job_id: str,
+    wait: float = Query(0, ge=0, description="Long-poll: seconds to wait for the job to finish"),
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Job status; with ``wait`` the request is held until the job finishes or the wait ends."""
+    deadline = time.monotonic() + min(wait, settings.chat_job_max_wait_seconds)
+    while True:
+        job = await db.get(ChatJob, job_id, populate_existing=True)
+        if not job or job.user_id != user.id:
+            raise HTTPException(status_code=404, detail="Not found")
+        remaining = deadline - time.monotonic()
+        if job.status in ("done", "failed") or remaining <= 0:
+            return job
+        # End the read transaction before waiting: the connection goes back to the pool, and the
+        # next check sees fresh data
+        await db.rollback()
+        # Wakes immediately for jobs run by this process; re-checks the DB every second otherwise
+        await chat_jobs.wait_for_update(job_id, min(1.0, remaining))
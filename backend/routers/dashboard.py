@@ -1,5 +1,6 @@
 """Dashboard: profile summary, stage, strength, todos."""
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from typing import List
 
@@ -10,7 +11,7 @@ from models.todo import Todo
 from models.university import UniversityShortlist
 from auth import get_current_user
 from services.stage import get_stage, get_stage_label
-from services.profile_strength import strength_academics, strength_exams, strength_sop
+from services.versioning import conditional_get
 from schemas.profile import ProfileResponse
 from schemas.todo import TodoResponse
 
@@ -18,19 +19,23 @@ router = APIRouter(prefix="/dashboard", tags=["dashboard"])
 
 
 @router.get("")
-def get_dashboard(user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def get_dashboard(
+    request: Request,
+    response: Response,
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Read-only: strengths are stored when the profile is written (routers.profile)."""
+    not_modified = conditional_get(request, response, "dashboard", db, user.id)
+    if not_modified:
+        return not_modified
     profile = db.query(Profile).filter(Profile.user_id == user.id).first()
-    shortlists = db.query(UniversityShortlist).filter(UniversityShortlist.user_id == user.id).all()
-    locked_count = sum(1 for s in shortlists if s.locked)
-    stage = get_stage(profile, len(shortlists), locked_count)
-
-    # Update cached strengths if we have a simple calculator
-    if profile:
-        profile.strength_academics = strength_academics(profile.gpa, profile.degree_major)
-        # profile.exams is a JSON list of {name, status}
-        profile.strength_exams = strength_exams(profile.exams)
-        profile.strength_sop = strength_sop(profile.sop_status)
-        db.commit()
+    # Both counts in one aggregate query instead of loading every shortlist row
+    shortlisted_count, locked_count = db.query(
+        func.count(UniversityShortlist.id),
+        func.count(UniversityShortlist.id).filter(UniversityShortlist.locked.is_(True)),
+    ).filter(UniversityShortlist.user_id == user.id).one()
+    stage = get_stage(profile, shortlisted_count, locked_count)
 
     todos = db.query(Todo).filter(Todo.user_id == user.id).order_by(Todo.created_at).all()
 
@@ -42,14 +47,14 @@ def get_dashboard(user: User = Depends(get_current_user), db: Session = Depends(
             "budget": f"{profile.budget_min or '?'} - {profile.budget_max or '?'}" if (profile.budget_min or profile.budget_max) else "—",
         } if profile else None,
         "profile_strength": {
-            "academics": profile.strength_academics if profile else "—",
-            "exams": profile.strength_exams if profile else "—",
-            "sop": profile.strength_sop if profile else "—",
+            "academics": profile.strength_academics or "—",
+            "exams": profile.strength_exams or "—",
+            "sop": profile.strength_sop or "—",
         } if profile else None,
         "stage": stage,
         "stage_label": get_stage_label(stage),
         "onboarding_complete": bool(profile and profile.onboarding_complete),
         "todos": [TodoResponse.model_validate(t) for t in todos],
-        "shortlisted_count": len(shortlists),
+        "shortlisted_count": shortlisted_count,
         "locked_count": locked_count,
     }
@@ -8,6 +8,8 @@ from models.user import User
 from models.profile import Profile
 from schemas.profile import ProfileCreate, ProfileUpdate, ProfileResponse
 from auth import get_current_user
+from services.profile_strength import apply_strengths
+from services.versioning import bump_data_version
 
 router = APIRouter(prefix="/profile", tags=["profile"])
 
@@ -34,6 +36,9 @@ def update_profile(
     profile = _get_or_404(db, user.id)
     for k, v in data.model_dump(exclude_unset=True).items():
         setattr(profile, k, v)
+    # Strengths are derived from the fields above; keep them current so reads never write
+    apply_strengths(profile)
+    bump_data_version(db, user.id)
     db.commit()
     db.refresh(profile)
     return profile
@@ -47,5 +52,6 @@ def complete_onboarding(
     """Mark onboarding complete. Requires required fields to be set."""
     profile = _get_or_404(db, user.id)
     profile.onboarding_complete = True
+    bump_data_version(db, user.id)
     db.commit()
     return {"onboarding_complete": True}
@@ -1,6 +1,6 @@
 """To-do list CRUD."""
 import uuid
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 
 from database import get_db
@@ -8,12 +8,21 @@ from models.user import User
 from models.todo import Todo
 from schemas.todo import TodoCreate, TodoUpdate, TodoResponse
 from auth import get_current_user
+from services.versioning import bump_data_version, conditional_get
 
 router = APIRouter(prefix="/todos", tags=["todos"])
 
 
 @router.get("", response_model=list[TodoResponse])
-def list_todos(user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def list_todos(
+    request: Request,
+    response: Response,
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    not_modified = conditional_get(request, response, "todos", db, user.id)
+    if not_modified:
+        return not_modified
     return db.query(Todo).filter(Todo.user_id == user.id).order_by(Todo.created_at).all()
 
 
@@ -42,6 +51,7 @@ def create_todo(
         category=data.category,
     )
     db.add(todo)
+    bump_data_version(db, user.id)
     db.commit()
     db.refresh(todo)
     return todo
@@ -59,6 +69,7 @@ def update_todo(
         raise HTTPException(status_code=404, detail="Not found")
     for k, v in data.model_dump(exclude_unset=True).items():
         setattr(todo, k, v)
+    bump_data_version(db, user.id)
     db.commit()
     db.refresh(todo)
     return todo
@@ -74,5 +85,6 @@ def delete_todo(
     if not todo:
         raise HTTPException(status_code=404, detail="Not found")
     db.delete(todo)
+    bump_data_version(db, user.id)
     db.commit()
     return {"ok": True}
@@ -1,8 +1,11 @@
 """University discovery, shortlist, and locking."""
+import asyncio
 import uuid
-from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Literal
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 
+from config import settings
 from database import get_db
 from models.user import User
 from models.profile import Profile
@@ -10,28 +13,84 @@ from models.university import UniversityShortlist
 from models.todo import Todo
 from auth import get_current_user
 from schemas.university import UniversityShortlistCreate, UniversityShortlistResponse, UniversityLock
-from services.universities import fetch_universities
+from services import autocomplete
+from services.amounts import parse_acceptance_pct, parse_cost_inr
+from services.ranking import rank_candidates, ranking_profile
+from services.universities import fetch_universities, search_universities
+from services.versioning import bump_data_version, conditional_get
 from services.stage import get_stage
 import uuid
 
 router = APIRouter(prefix="/universities", tags=["universities"])
 
+# Candidates per preferred country handed to the ranking engine
+RECOMMENDATION_POOL_PER_COUNTRY = 1000
+
 
 @router.get("/search")
 async def search(
     country: str | None = Query(None),
     name: str | None = Query(None),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
+    page_size: int = Query(settings.universities_page_size, ge=1, le=settings.universities_max_page_size),
     user: User = Depends(get_current_user),
 ):
-    """Search external API for universities. Returns list with cost/acceptance."""
-    results = await fetch_universities(country=country, name=name)
-    return {"universities": results}
+    """Search the local university catalog. Returns a page of results with cost/acceptance."""
+    try:
+        page = await search_universities(country=country, name=name, page_size=page_size, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {**page, "page_size": page_size}
+
+
+@router.get("/autocomplete")
+def autocomplete_names(
+    q: str = Query(..., min_length=1, max_length=100),
+    country: str | None = Query(None),
+    limit: int = Query(10, ge=1, le=25),
+    user: User = Depends(get_current_user),
+):
+    """Search-as-you-type over university names: prefixes, acronyms (MIT, TUM) and typos."""
+    matches = autocomplete.index.search(q, country=country, limit=limit)
+    return {"suggestions": [m._asdict() for m in matches]}
+
+
+# Shortlist sort keys; rows without a parsed value sort last either way
+SHORTLIST_SORTS = {
+    "cost": UniversityShortlist.annual_cost_inr.asc().nulls_last(),
+    "-cost": UniversityShortlist.annual_cost_inr.desc().nulls_last(),
+    "acceptance": UniversityShortlist.acceptance_pct.asc().nulls_last(),
+    "-acceptance": UniversityShortlist.acceptance_pct.desc().nulls_last(),
+}
 
 
 @router.get("/shortlist", response_model=list[UniversityShortlistResponse])
-def list_shortlist(user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    rows = db.query(UniversityShortlist).filter(UniversityShortlist.user_id == user.id).order_by(UniversityShortlist.locked.desc(), UniversityShortlist.created_at).all()
-    return rows
+def list_shortlist(
+    request: Request,
+    response: Response,
+    min_cost: int | None = Query(None, ge=0, description="Minimum annual cost in INR"),
+    max_cost: int | None = Query(None, ge=0, description="Maximum annual cost in INR"),
+    min_acceptance: float | None = Query(None, ge=0, le=100),
+    sort: Literal["cost", "-cost", "acceptance", "-acceptance"] | None = Query(None),
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """The user's shortlist, locked first; optionally filtered by cost/acceptance and sorted."""
+    not_modified = conditional_get(request, response, "shortlist", db, user.id)
+    if not_modified:
+        return not_modified
+    q = db.query(UniversityShortlist).filter(UniversityShortlist.user_id == user.id)
+    if min_cost is not None:
+        q = q.filter(UniversityShortlist.annual_cost_inr >= min_cost)
+    if max_cost is not None:
+        q = q.filter(UniversityShortlist.annual_cost_inr <= max_cost)
+    if min_acceptance is not None:
+        q = q.filter(UniversityShortlist.acceptance_pct >= min_acceptance)
+    if sort:
+        q = q.order_by(SHORTLIST_SORTS[sort], UniversityShortlist.created_at)
+    else:
+        q = q.order_by(UniversityShortlist.locked.desc(), UniversityShortlist.created_at)
+    return q.all()
 
 
 @router.post("/shortlist", response_model=UniversityShortlistResponse)
@@ -50,10 +109,13 @@ def add_to_shortlist(
         category=data.category,
         cost_level=data.cost_level,
         acceptance_chance=data.acceptance_chance,
+        annual_cost_inr=parse_cost_inr(data.cost_level),
+        acceptance_pct=parse_acceptance_pct(data.acceptance_chance),
         fit_reason=data.fit_reason,
         risks=data.risks,
     )
     db.add(rec)
+    bump_data_version(db, user.id)
     db.commit()
     db.refresh(rec)
     return rec
@@ -77,6 +139,7 @@ def remove_from_shortlist(
     except Exception:
         pass
     db.delete(rec)
+    bump_data_version(db, user.id)
     db.commit()
     return {"ok": True}
 
@@ -97,6 +160,7 @@ def set_lock(
     # If locking newly, generate recommended todo checklist for this university
     was_locked = bool(rec.locked)
     rec.locked = body.lock
+    bump_data_version(db, user.id)
     db.commit()
 
     if body.lock and not was_locked:
@@ -145,6 +209,8 @@ def set_lock(
                 category=t.get("category"),
             )
             db.add(todo)
+        # Bumped again so the version seen after the lock commit doesn't cover these todos
+        bump_data_version(db, user.id)
         db.commit()
 
     return {"locked": rec.locked}
@@ -157,42 +223,44 @@ async def recommendations(
 ):
     """Return universities tailored to profile (preferred countries) as dream/target/safe."""
     profile = db.query(Profile).filter(Profile.user_id == user.id).first()
-    countries = (profile.preferred_countries or [])[:3] or ["United States", "United Kingdom", "Canada"]
-    all_recs = []
+    countries = ((profile.preferred_countries if profile else None) or [])[:3] or ["United States", "United Kingdom", "Canada"]
     print(f"[DEBUG] Fetching recommendations for countries: {countries}")
-    
-    for c in countries:
-        try:
-            recs = await fetch_universities(country=c)
-            for r in recs:
-                r["category"] = _category_for(r.get("acceptance_chance", "medium"), r.get("cost_level", "medium"))
-            all_recs.extend(recs[:15])
-            print(f"[DEBUG] Got {len(recs)} recommendations for {c}")
-        except Exception as e:
-            print(f"[DEBUG] Error fetching recommendations for {c}: {e}")
-            continue
-    
+
+    # All countries at once, each with its own deadline; a slow country is dropped, not waited on
+    results = await asyncio.gather(*(_fetch_country(c) for c in countries))
+    timed_out = []
     # Dedupe by name
     seen = set()
-    out = []
-    for r in all_recs:
-        if r["name"] in seen:
+    candidates = []
+    for c, recs in zip(countries, results):
+        if recs is None:
+            timed_out.append(c)
             continue
-        seen.add(r["name"])
-        out.append(r)
-    
-    dream = [x for x in out if x.get("category") == "dream"]
-    target = [x for x in out if x.get("category") == "target"]
-    safe = [x for x in out if x.get("category") == "safe"]
-    print(f"[DEBUG] Returning {len(dream)} dream, {len(target)} target, {len(safe)} safe universities")
-    result = {"dream": dream[:5], "target": target[:5], "safe": safe[:5]}
-    print(f"[DEBUG] Final response object: {result}")
+        print(f"[DEBUG] Got {len(recs)} candidates for {c}")
+        for r in recs:
+            if r["name"] in seen:
+                continue
+            seen.add(r["name"])
+            candidates.append(r)
+
+    result = rank_candidates(candidates, ranking_profile(profile), k=5)
+    print(f"[DEBUG] Ranked {len(candidates)} candidates: "
+          f"{len(result['dream'])} dream, {len(result['target'])} target, {len(result['safe'])} safe")
+    result["timed_out_countries"] = timed_out
     return result
 
 
-def _category_for(acceptance: str, cost: str) -> str:
-    if acceptance == "low" and cost in ("high", "medium"):
-        return "dream"
-    if acceptance == "high":
-        return "safe"
-    return "target"
+async def _fetch_country(country: str) -> list[dict] | None:
+    """Universities for one country, or None if it missed the deadline."""
+    try:
+        return await asyncio.wait_for(
+            fetch_universities(country=country, limit=RECOMMENDATION_POOL_PER_COUNTRY),
+            settings.recommendations_country_timeout_seconds,
+        )
+    except asyncio.TimeoutError:
+        print(f"[DEBUG] Recommendations for {country} timed out")
+        return None
+    except Exception as e:
+        print(f"[DEBUG] Error fetching recommendations for {country}: {e}")
+        return []
+
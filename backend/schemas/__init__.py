@@ -2,12 +2,12 @@ from .auth import Token, TokenData, UserCreate, UserLogin, UserResponse
 from .profile import ProfileCreate, ProfileUpdate, ProfileResponse
 from .university import UniversityShortlistCreate, UniversityShortlistResponse, UniversityLock
 from .todo import TodoCreate, TodoUpdate, TodoResponse
-from .chat import ChatMessageCreate, ChatMessageResponse, CounsellorResponse
+from .chat import ChatMessageCreate, ChatMessageResponse, CounsellorResponse, ChatJobResponse
 
 __all__ = [
     "Token", "TokenData", "UserCreate", "UserLogin", "UserResponse",
     "ProfileCreate", "ProfileUpdate", "ProfileResponse",
     "UniversityShortlistCreate", "UniversityShortlistResponse", "UniversityLock",
     "TodoCreate", "TodoUpdate", "TodoResponse",
-    "ChatMessageCreate", "ChatMessageResponse", "CounsellorResponse",
+    "ChatMessageCreate", "ChatMessageResponse", "CounsellorResponse", "ChatJobResponse",
 ]
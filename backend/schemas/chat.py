@@ -19,3 +19,13 @@ class ChatMessageResponse(BaseModel):
 class CounsellorResponse(BaseModel):
     message: str
     actions: Optional[List[Any]] = None  # shortlist_add, lock, todo_add, etc.
+
+
+class ChatJobResponse(BaseModel):
+    id: str
+    status: str  # queued / running / done / failed
+    result: Optional[CounsellorResponse] = None
+    error: Optional[str] = None
+
+    class Config:
+        from_attributes = True
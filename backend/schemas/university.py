@@ -18,6 +18,8 @@ class UniversityShortlistResponse(UniversityShortlistCreate):
     id: str
     user_id: str
     locked: bool
+    annual_cost_inr: Optional[int] = None  # Parsed from cost_level
+    acceptance_pct: Optional[float] = None  # Parsed from acceptance_chance
 
     class Config:
         from_attributes = True
@@ -0,0 +1,177 @@
+"""Single-pass extraction of ``ACTIONS: [...]`` blocks from counsellor replies.
+
+The scanner walks the reply once, left to right, and can be fed chunk by chunk while a reply
+streams in. Prose is returned as soon as it is known not to belong to an ACTIONS block; the
+JSON arrays are tracked with a bracket- and string-aware state machine, so a ``]`` inside a
+string value or in text after the block never confuses it, and every block is collected.
+"""
+import json
+import re
+from typing import List, Tuple
+
+ACTIONS_MARKER = "ACTIONS:"
+
+# Outside a JSON string only brackets and quotes matter; inside one, quotes and escapes
+_ARRAY_TOKENS = re.compile(r'[\[\]"]')
+_STRING_TOKENS = re.compile(r'["\\]')
+
+_TEXT, _AFTER_MARKER, _ARRAY = range(3)
+
+
+def _partial_marker_len(text: str) -> int:
+    """Length of the longest suffix of ``text`` that is a proper prefix of the marker."""
+    if text.rfind(ACTIONS_MARKER[0], -(len(ACTIONS_MARKER) - 1)) == -1:
+        return 0
+    for n in range(min(len(ACTIONS_MARKER) - 1, len(text)), 0, -1):
+        if text.endswith(ACTIONS_MARKER[:n]):
+            return n
+    return 0
+
+
+class ActionsScanner:
+    """Incremental ACTIONS extractor.
+
+    ``feed()`` returns the prose that can be forwarded right away; ``close()`` returns whatever
+    was still held back. Afterwards ``text`` is the full cleaned reply and ``actions`` every
+    action (dicts only) from every block, in order.
+    """
+
+    def __init__(self) -> None:
+        self.actions: List[dict] = []
+        self._emitted: List[str] = []
+        self._pending = ""          # unprocessed input (held marker prefix / whitespace)
+        self._state = _TEXT
+        self._marker_ws = ""         # whitespace before a marker, restored if it is not a block
+        self._array: List[str] = []  # current ACTIONS array source
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._need_separator = False
+
+    @property
+    def text(self) -> str:
+        return "".join(self._emitted)
+
+    def feed(self, chunk: str) -> str:
+        out: List[str] = []
+        buf = self._pending + chunk
+        self._pending = ""
+        while buf:
+            if self._state == _TEXT:
+                idx = buf.find(ACTIONS_MARKER)
+                if idx == -1:
+                    # Hold a possible partial marker and trailing whitespace until more arrives
+                    cut = len(buf) - _partial_marker_len(buf)
+                    head = buf[:cut].rstrip()
+                    self._emit(head, out)
+                    self._pending = buf[len(head):]
+                    break
+                head = buf[:idx].rstrip()
+                self._emit(head, out)
+                self._marker_ws = buf[len(head):idx]
+                buf = buf[idx + len(ACTIONS_MARKER):]
+                self._state = _AFTER_MARKER
+            elif self._state == _AFTER_MARKER:
+                rest = buf.lstrip()
+                if not rest:
+                    self._pending = buf
+                    break
+                if rest[0] != "[":
+                    # Not an actions block after all: the marker was ordinary prose
+                    self._emit(self._marker_ws + ACTIONS_MARKER + buf[:len(buf) - len(rest)], out)
+                    self._state = _TEXT
+                    buf = rest
+                    continue
+                self._state = _ARRAY
+                self._depth = 0
+                self._in_string = False
+                self._escape = False
+                buf = rest
+            else:
+                end = self._scan_array(buf)
+                if end == -1:
+                    self._array.append(buf)
+                    break
+                self._array.append(buf[:end])
+                self._finish_block()
+                buf = buf[end:].lstrip()
+                self._state = _TEXT
+        return "".join(out)
+
+    def close(self) -> str:
+        out: List[str] = []
+        if self._state == _TEXT:
+            self._emit(self._pending.rstrip(), out)
+        elif self._state == _ARRAY:
+            print(f"[DEBUG] Unterminated ACTIONS block dropped: {''.join(self._array)[:200]}")
+        self._pending = ""
+        self._array = []
+        self._state = _TEXT
+        return "".join(out)
+
+    def _emit(self, text: str, out: List[str]) -> None:
+        if not text:
+            return
+        if not self._emitted:
+            text = text.lstrip()
+            if not text:
+                return
+        elif self._need_separator:
+            text = "\n\n" + text.lstrip()
+        self._need_separator = False
+        self._emitted.append(text)
+        out.append(text)
+
+    def _scan_array(self, buf: str) -> int:
+        """Advance the bracket/string state over ``buf``; index just past the closing ``]`` or -1."""
+        pos = 0
+        if self._escape:
+            self._escape = False
+            pos = 1
+        while pos < len(buf):
+            if self._in_string:
+                m = _STRING_TOKENS.search(buf, pos)
+                if not m:
+                    return -1
+                pos = m.end()
+                if m.group() == "\\":
+                    if pos >= len(buf):
+                        self._escape = True
+                        return -1
+                    pos += 1
+                else:
+                    self._in_string = False
+            else:
+                m = _ARRAY_TOKENS.search(buf, pos)
+                if not m:
+                    return -1
+                pos = m.end()
+                tok = m.group()
+                if tok == '"':
+                    self._in_string = True
+                elif tok == "[":
+                    self._depth += 1
+                else:
+                    self._depth -= 1
+                    if self._depth == 0:
+                        return pos
+        return -1
+
+    def _finish_block(self) -> None:
+        raw = "".join(self._array)
+        self._array = []
+        self._need_separator = True
+        try:
+            parsed = json.loads(raw)
+        except json.JSONDecodeError as e:
+            print(f"[DEBUG] Failed to parse ACTIONS JSON: {e}. Raw: {raw}")
+            return
+        self.actions.extend(a for a in parsed if isinstance(a, dict))
+
+
+def extract_actions(text: str) -> Tuple[str, List[dict]]:
+    """Cleaned reply text and all actions from a complete reply, in one pass."""
+    scanner = ActionsScanner()
+    scanner.feed(text)
+    scanner.close()
+    return scanner.text, scanner.actions
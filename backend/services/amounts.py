@@ -0,0 +1,77 @@
+"""Tolerant parsers for the free-text cost and acceptance strings stored on shortlist rows.
+
+Values come from search results ("₹30,00,000", "35%") and from the LLM ("₹19.5 lakh",
+"$36k per year", "around 10-15%"). A range counts as its first (lower) number. Anything
+without a number ("high", "competitive") parses to None. When a cost quotes several currencies
+("₹30,00,000 (~$36,000)") the rupee amount wins.
+
+migrations/0002_shortlist_numeric_columns.py backfills existing rows with these functions.
+"""
+import re
+from typing import Optional, Union
+
+_NUMBER = re.compile(r"\d+(?:\.\d+)?")
+# One amount: a number (a range counts as its first number) and an optional magnitude after it
+_AMOUNT = r"(\d+(?:\.\d+)?)(?:\s*(?:-|–|to)\s*\d+(?:\.\d+)?)?\s*(crores?|cr\b|lakhs?|lacs?\b|l\b|million|mn\b|k\b)?"
+# Currency markers with a rough INR rate (order of magnitude is what matters), in order of
+# preference: "₹30,00,000 (~$36,000)" is the rupee figure, the rate only applies to an amount
+# its marker is attached to, and an amount with no marker counts as INR.
+_CURRENCIES = (
+    (r"₹|\brs\b\.?|\binr\b", 1),
+    (r"\$|\busd\b", 83),
+    (r"£|\bgbp\b", 105),
+    (r"€|\beur\b", 90),
+)
+_MARKED_AMOUNTS = tuple(
+    (re.compile(rf"(?:{marker})\s*{_AMOUNT}|{_AMOUNT}\s*(?:{marker})"), rate) for marker, rate in _CURRENCIES
+) + ((re.compile(_AMOUNT), 1),)
+_MAGNITUDES = (("cr", 10_000_000), ("l", 100_000), ("m", 1_000_000), ("k", 1_000))
+# Anything above this is a parsing accident, not a yearly cost (and would overflow the column)
+MAX_COST_INR = 100_000_000
+
+
+def parse_cost_inr(value: Union[str, int, float, None]) -> Optional[int]:
+    """Annual cost in INR, or None if ``value`` holds no plausible amount."""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return int(round(value)) if 0 <= value <= MAX_COST_INR else None
+    text = value.lower().replace(",", "")
+    for pattern, rate in _MARKED_AMOUNTS:
+        match = pattern.search(text)
+        if match:
+            break
+    else:
+        return None
+    groups = match.groups()
+    number, unit = (groups[0], groups[1]) if groups[0] is not None else (groups[2], groups[3])
+    amount = float(number) * rate
+    for prefix, factor in _MAGNITUDES:
+        if unit and unit.startswith(prefix):
+            amount *= factor
+            break
+    amount = round(amount)
+    return int(amount) if amount <= MAX_COST_INR else None
+
+
+def parse_acceptance_pct(value: Union[str, int, float, None]) -> Optional[float]:
+    """Acceptance rate as a percentage in [0, 100], or None.
+
+    A bare decimal fraction ("0.35", 0.35) is read as a share; anything else, including a bare
+    whole number ("1"), as percent.
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        pct = float(value)
+        fraction = isinstance(value, float) and pct <= 1
+    else:
+        text = value.replace(",", ".")
+        match = _NUMBER.search(text)
+        if not match:
+            return None
+        pct = float(match.group())
+        fraction = pct <= 1 and "." in match.group() and "%" not in text
+    if fraction:
+        pct *= 100
+    return round(pct, 2) if 0 <= pct <= 100 else None
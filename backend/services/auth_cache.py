@@ -0,0 +1,51 @@
+"""Bounded in-process caches for the auth fast path (verified tokens, active-user snapshots).
+
+Entries carry an absolute wall-clock expiry, so a cached token never outlives its ``exp``.
+Sync dependencies run in FastAPI's threadpool, hence the lock.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+from services.metrics import CACHE_ENTRIES, CACHE_REQUESTS
+
+
+class ExpiringLRU:
+    def __init__(self, name: str, maxsize: int):
+        self.name = name
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        CACHE_ENTRIES.labels(cache=name).set_function(lambda: len(self._entries))
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.time():
+                self._entries.move_to_end(key)
+                result = "hit"
+            else:
+                if entry is not None:
+                    del self._entries[key]
+                entry = None
+                result = "miss"
+        CACHE_REQUESTS.labels(cache=self.name, result=result).inc()
+        return entry[1] if entry else None
+
+    def set(self, key: Hashable, value: Any, expires_at: float) -> None:
+        if expires_at <= time.time():
+            return
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,150 @@
+"""In-memory typeahead index over the university catalog (GET /universities/autocomplete).
+
+Loaded from the ``universities`` table at startup. Every university is reachable by:
+- a prefix of its diacritic-folded name, or of any word suffix of it ("munich" in
+  "technical university of munich");
+- its acronym ("MIT", "TUM", "UCLA"), formed from the initials of its significant words;
+- the first label of its web domain ("mit" for mit.edu).
+Prefix lookups are a bisect over sorted keys. When they return fewer than ``limit`` results,
+the rest come from trigram similarity (Jaccard), counted with NumPy over the postings lists.
+"""
+import bisect
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import select
+
+from database import AsyncSessionLocal
+from models.university import University
+from services.universities import normalize_name
+
+# Words left out of acronyms ("Massachusetts Institute of Technology" -> "mit")
+STOPWORDS = {"of", "the", "and", "for", "in", "at", "de", "del", "des", "la", "le", "du", "di", "da", "y", "et", "und", "fur"}
+# Key kinds, in ranking order for prefix matches
+KIND_ACRONYM, KIND_NAME, KIND_WORD = 0, 1, 2
+# Matching keys examined per prefix lookup (bounds one-letter queries)
+MAX_PREFIX_SCAN = 256
+MIN_FUZZY_QUERY = 3
+MIN_SIMILARITY = 0.3
+
+
+class Suggestion(NamedTuple):
+    name: str
+    country: str
+    domain: Optional[str]
+    web_page: Optional[str]
+
+
+def acronym(normalized: str) -> Optional[str]:
+    words = [w for w in normalized.split() if w not in STOPWORDS]
+    if len(words) < 2:
+        return None
+    return "".join(w[0] for w in words)
+
+
+def trigrams(normalized: str) -> set:
+    padded = f"  {normalized} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class AutocompleteIndex:
+    def __init__(self, entries: Sequence[Suggestion]):
+        self.entries = list(entries)
+        self.normalized = [normalize_name(e.name) for e in self.entries]
+        countries = sorted({e.country for e in self.entries})
+        self._country_code = {c: i for i, c in enumerate(countries)}
+        self._entry_country = np.array([self._country_code[e.country] for e in self.entries], dtype=np.int32)
+
+        keys: List[tuple] = []
+        postings: Dict[str, List[int]] = {}
+        gram_counts = np.zeros(len(self.entries), dtype=np.int32)
+        for i, (entry, norm) in enumerate(zip(self.entries, self.normalized)):
+            if not norm:
+                continue
+            words = norm.split()
+            keys.append((norm, KIND_NAME, i))
+            for w in range(1, len(words)):
+                keys.append((" ".join(words[w:]), KIND_WORD, i))
+            short = acronym(norm)
+            if short:
+                keys.append((short, KIND_ACRONYM, i))
+            if entry.domain:
+                label = normalize_name(entry.domain.split(".")[0])
+                if label and label != short:
+                    keys.append((label, KIND_ACRONYM, i))
+            grams = trigrams(norm)
+            gram_counts[i] = len(grams)
+            for g in grams:
+                postings.setdefault(g, []).append(i)
+
+        keys.sort()
+        self._keys = keys
+        self._key_strings = [k[0] for k in keys]
+        # Per-country key lists so scoped lookups don't scan other countries' matches
+        by_country: Dict[int, List[tuple]] = {}
+        for k in keys:
+            by_country.setdefault(int(self._entry_country[k[2]]), []).append(k)
+        self._country_keys = {c: (ks, [k[0] for k in ks]) for c, ks in by_country.items()}
+        self._postings = {g: np.array(ids, dtype=np.int32) for g, ids in postings.items()}
+        self._gram_counts = gram_counts
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def search(self, query: str, country: Optional[str] = None, limit: int = 10) -> List[Suggestion]:
+        q = normalize_name(query or "")
+        if not q or limit <= 0:
+            return []
+        code = None
+        if country:
+            code = self._country_code.get(country.strip())
+            if code is None:
+                return []
+
+        ids = self._prefix(q, code, limit)
+        if len(ids) < limit and len(q) >= MIN_FUZZY_QUERY:
+            seen = set(ids)
+            ids += [i for i in self._fuzzy(q, code, limit + len(ids)) if i not in seen][:limit - len(ids)]
+        return [self.entries[i] for i in ids]
+
+    def _prefix(self, q: str, code: Optional[int], limit: int) -> List[int]:
+        keys, strings = (self._keys, self._key_strings) if code is None else self._country_keys.get(code, ([], []))
+        start = bisect.bisect_left(strings, q)
+        best: Dict[int, tuple] = {}
+        for key, kind, i in keys[start:start + MAX_PREFIX_SCAN]:
+            if not key.startswith(q):
+                break
+            # Exact key first, then acronym > full name > word, then shorter names
+            rank = (key != q, kind, len(self.normalized[i]), self.normalized[i])
+            if i not in best or rank < best[i]:
+                best[i] = rank
+        return sorted(best, key=best.__getitem__)[:limit]
+
+    def _fuzzy(self, q: str, code: Optional[int], limit: int) -> List[int]:
+        grams = [self._postings[g] for g in trigrams(q) if g in self._postings]
+        if not grams:
+            return []
+        overlap = np.bincount(np.concatenate(grams), minlength=len(self.entries))
+        similarity = overlap / (len(trigrams(q)) + self._gram_counts - overlap)
+        if code is not None:
+            similarity[self._entry_country != code] = 0.0
+        candidates = np.flatnonzero(similarity >= MIN_SIMILARITY)
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(-similarity[candidates], limit - 1)[:limit]]
+        return candidates[np.lexsort((candidates, -similarity[candidates]))].tolist()
+
+
+index = AutocompleteIndex([])
+
+
+async def load() -> None:
+    """(Re)build the index from the catalog; called from ``main.lifespan``."""
+    global index
+    async with AsyncSessionLocal() as db:
+        rows = (await db.execute(
+            select(University.name, University.country, University.domains, University.web_pages)
+        )).all()
+    index = AutocompleteIndex([
+        Suggestion(r.name, r.country, (r.domains or [None])[0], (r.web_pages or [None])[0]) for r in rows
+    ])
+    print(f"[DEBUG] Autocomplete index loaded with {len(index)} universities")
@@ -0,0 +1,81 @@
+"""In-process async cache: LRU size bound, TTL, stale-while-revalidate and single-flight loads.
+
+A fresh entry is returned as is. A stale one (older than ``ttl`` but within ``stale_ttl``) is
+returned immediately while one background task reloads it. On a miss, concurrent callers for the
+same key share a single load (including one that joins a running refresh). Failed loads are
+not cached and raise to every caller waiting on them.
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Generic, Hashable, TypeVar
+
+from services.metrics import CACHE_ENTRIES, CACHE_REFRESHES, CACHE_REQUESTS
+
+T = TypeVar("T")
+
+
+class AsyncTTLCache(Generic[T]):
+    def __init__(self, name: str, maxsize: int, ttl: float, stale_ttl: float):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._entries: "OrderedDict[Hashable, tuple[float, T]]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        CACHE_ENTRIES.labels(cache=name).set_function(lambda: len(self._entries))
+
+    def _count(self, result: str) -> None:
+        CACHE_REQUESTS.labels(cache=self.name, result=result).inc()
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[T]]) -> T:
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = time.monotonic() - entry[0]
+            if age < self.ttl:
+                self._entries.move_to_end(key)
+                self._count("hit")
+                return entry[1]
+            if age < self.ttl + self.stale_ttl:
+                self._entries.move_to_end(key)
+                self._count("stale")
+                self._load(key, loader, refresh=True)
+                return entry[1]
+        self._count("miss")
+        # Shield so a cancelled caller doesn't cancel the load other callers are waiting on
+        return await asyncio.shield(self._load(key, loader, refresh=False))
+
+    def _load(self, key: Hashable, loader: Callable[[], Awaitable[T]], refresh: bool) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._run_load(key, loader, refresh))
+            self._inflight[key] = task
+            if refresh:
+                # Nobody may await a background refresh; retrieve its error so it isn't reported
+                # as never retrieved (misses that joined it still get it raised)
+                task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        return task
+
+    async def _run_load(self, key: Hashable, loader: Callable[[], Awaitable[T]], refresh: bool) -> T:
+        try:
+            value = await loader()
+        except Exception as e:
+            if refresh:
+                CACHE_REFRESHES.labels(cache=self.name, outcome="error").inc()
+                print(f"[DEBUG] {self.name} cache refresh for {key!r} failed: {e!r}")
+            raise  # the stale value stays in place for later hits
+        finally:
+            self._inflight.pop(key, None)
+        if refresh:
+            CACHE_REFRESHES.labels(cache=self.name, outcome="ok").inc()
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {"name": self.name, "entries": len(self._entries), "maxsize": self.maxsize, "loading": len(self._inflight)}
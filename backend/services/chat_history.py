@@ -0,0 +1,105 @@
+"""Chat history compaction: a rolling per-user summary plus the most recent turns.
+
+Messages newer than ``ChatSummary.summarized_until`` are sent verbatim (newest first, until
+the recent-turn count or token budget is reached). Everything older than the oldest message
+sent is folded into the summary incrementally by
+``services.counsellor.refresh_conversation_summary`` after each reply.
+"""
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings
+from models.chat import ChatMessage, ChatSummary
+
+# Cap on how many messages one refresh folds, so a long backlog is summarized over a few turns
+MAX_FOLD_BATCH = 40
+# Long assistant write-ups are clipped before being handed to the summarizer
+MAX_FOLD_MESSAGE_CHARS = 2000
+
+
+def estimate_tokens(text: str) -> int:
+    # ~4 characters per token is close enough for budgeting English prompts
+    return len(text) // 4 + 1
+
+
+async def get_summary(db: AsyncSession, user_id: str) -> Optional[ChatSummary]:
+    return await db.get(ChatSummary, user_id)
+
+
+async def load_recent_messages(
+    db: AsyncSession,
+    user_id: str,
+    summary: Optional[ChatSummary],
+    before: Optional[datetime] = None,
+) -> List[ChatMessage]:
+    """Most recent unsummarized messages that fit the turn count and token budget, oldest first.
+
+    ``before`` limits history to messages older than a given (already saved) message.
+    """
+    max_messages = settings.chat_history_recent_turns * 2
+    query = select(ChatMessage).where(ChatMessage.user_id == user_id)
+    if summary and summary.summarized_until:
+        query = query.where(ChatMessage.created_at > summary.summarized_until)
+    if before is not None:
+        query = query.where(ChatMessage.created_at < before)
+    rows = (await db.execute(query.order_by(ChatMessage.created_at.desc()).limit(max_messages))).scalars().all()
+
+    budget = settings.chat_history_token_budget
+    kept: List[ChatMessage] = []
+    used = 0
+    for r in rows:
+        cost = estimate_tokens(r.content)
+        if kept and used + cost > budget:
+            break
+        kept.append(r)
+        used += cost
+    kept.reverse()
+    # Gemini expects the conversation to open with a user turn
+    while kept and kept[0].role != "user":
+        kept.pop(0)
+    return kept
+
+
+async def load_messages_to_fold(db: AsyncSession, user_id: str, summary: Optional[ChatSummary]) -> List[ChatMessage]:
+    """Unsummarized messages older than the ones sent verbatim, oldest first (at most MAX_FOLD_BATCH).
+
+    The boundary is the oldest message ``load_recent_messages`` actually keeps, so messages it
+    drops for the token budget are folded too instead of silently leaving the context.
+    """
+    recent = await load_recent_messages(db, user_id, summary)
+    query = select(ChatMessage).where(ChatMessage.user_id == user_id)
+    if summary and summary.summarized_until:
+        query = query.where(ChatMessage.created_at > summary.summarized_until)
+    if recent:
+        query = query.where(ChatMessage.created_at < recent[0].created_at)
+    query = query.order_by(ChatMessage.created_at).limit(MAX_FOLD_BATCH)
+    return list((await db.execute(query)).scalars().all())
+
+
+def format_for_summary(messages: List[ChatMessage]) -> str:
+    lines = []
+    for m in messages:
+        speaker = "Student" if m.role == "user" else "Counsellor"
+        content = m.content
+        if len(content) > MAX_FOLD_MESSAGE_CHARS:
+            content = content[:MAX_FOLD_MESSAGE_CHARS] + " …"
+        lines.append(f"{speaker}: {content}")
+    return "\n\n".join(lines)
+
+
+async def save_summary(
+    db: AsyncSession,
+    user_id: str,
+    summary: Optional[ChatSummary],
+    text: str,
+    summarized_until: datetime,
+) -> None:
+    if summary is None:
+        summary = ChatSummary(user_id=user_id)
+        db.add(summary)
+    summary.summary = text
+    summary.summarized_until = summarized_until
+    await db.commit()
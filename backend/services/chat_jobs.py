@@ -0,0 +1,190 @@
+"""Background chat jobs: an in-process queue drained by a pool of worker tasks.
+
+The job row and the user message are committed before the job is queued, so the job survives
+the request. Workers claim a job with a conditional UPDATE (queued -> running); on startup,
+jobs still queued in the database are re-queued, so a restart loses no work and two
+processes never run the same job. A periodic sweep fails jobs left running by a process that
+died mid-job.
+"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import select, update
+
+from config import settings
+from database import AsyncSessionLocal
+from models.chat import ChatJob, ChatMessage
+from services.counsellor import invoke_counsellor, load_chat_context, refresh_conversation_summary, save_turn
+from services.llm_limits import LLMLimitExceeded, llm_limiter
+from services.metrics import CHAT_JOB_QUEUE_DEPTH
+
+JOB_ROUTE = "/counsellor/jobs"
+
+_queue: "asyncio.Queue[str]" = asyncio.Queue()
+_workers: List[asyncio.Task] = []
+# Set when a job finishes in this process (long-poll wake-up); other processes are polled
+_finished: Dict[str, asyncio.Event] = {}
+
+CHAT_JOB_QUEUE_DEPTH.set_function(lambda: _queue.qsize())
+
+
+def queue_depth() -> int:
+    return _queue.qsize()
+
+
+def is_saturated() -> bool:
+    return _queue.qsize() >= settings.chat_job_queue_max
+
+
+def enqueue(job_id: str) -> None:
+    _finished.setdefault(job_id, asyncio.Event())
+    _queue.put_nowait(job_id)
+
+
+async def wait_for_update(job_id: str, timeout: float) -> None:
+    """Sleep until ``job_id`` finishes in this process or ``timeout`` elapses."""
+    event = _finished.get(job_id)
+    if event is None:
+        await asyncio.sleep(timeout)
+        return
+    try:
+        await asyncio.wait_for(event.wait(), timeout)
+    except asyncio.TimeoutError:
+        pass
+
+
+async def start_workers() -> None:
+    await _recover_jobs()
+    for i in range(settings.chat_job_workers):
+        _workers.append(asyncio.create_task(_worker(i)))
+    _workers.append(asyncio.create_task(_sweep_orphaned_jobs()))
+
+
+async def stop_workers() -> None:
+    for task in _workers:
+        task.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+    _workers.clear()
+
+
+def _orphaned_after() -> float:
+    """Seconds after which a running job can't still be held by a live worker.
+
+    A job's run is bounded by the per-user and global admission waits (each at most
+    ``_admission_timeout()``) plus the LLM budget.
+    """
+    return 2 * (settings.llm_request_budget_seconds + 2 * _admission_timeout())
+
+
+def _admission_timeout() -> float:
+    # Long enough for the user's previous turn (one LLM budget) to finish; a job that still
+    # isn't admitted goes back in the queue rather than failing
+    return settings.llm_request_budget_seconds
+
+
+async def _fail_orphaned_jobs() -> int:
+    stale_before = datetime.now(timezone.utc) - timedelta(seconds=_orphaned_after())
+    async with AsyncSessionLocal() as db:
+        failed = await db.execute(
+            update(ChatJob)
+            .where(ChatJob.status == "running", ChatJob.updated_at < stale_before)
+            .values(status="failed", error="Interrupted by a server restart. Please send your message again.")
+        )
+        await db.commit()
+    return failed.rowcount
+
+
+async def _sweep_orphaned_jobs() -> None:
+    """Catch jobs orphaned by a restart or crash after startup (including this process's own)."""
+    while True:
+        await asyncio.sleep(_orphaned_after() / 2)
+        try:
+            failed = await _fail_orphaned_jobs()
+        except Exception as e:
+            print(f"[DEBUG] Chat job sweep failed: {e!r}")
+            continue
+        if failed:
+            print(f"[DEBUG] Failed {failed} orphaned chat jobs")
+
+
+async def _recover_jobs() -> None:
+    """Re-queue jobs left queued by a previous process; fail ones stuck running."""
+    await _fail_orphaned_jobs()
+    async with AsyncSessionLocal() as db:
+        queued = (await db.execute(
+            select(ChatJob.id).where(ChatJob.status == "queued").order_by(ChatJob.created_at)
+        )).scalars().all()
+    for job_id in queued:
+        enqueue(job_id)
+    if queued:
+        print(f"[DEBUG] Re-queued {len(queued)} chat jobs")
+
+
+async def _worker(n: int) -> None:
+    while True:
+        job_id = await _queue.get()
+        try:
+            await _run_job(job_id)
+        except Exception as e:
+            print(f"[DEBUG] Chat job {job_id} crashed in worker {n}: {e!r}")
+        finally:
+            _queue.task_done()
+            event = _finished.pop(job_id, None)
+            if event:
+                event.set()
+
+
+async def _run_job(job_id: str) -> None:
+    async with AsyncSessionLocal() as db:
+        claimed = await db.execute(
+            update(ChatJob)
+            .where(ChatJob.id == job_id, ChatJob.status == "queued")
+            .values(status="running", updated_at=datetime.now(timezone.utc))
+        )
+        await db.commit()
+        if claimed.rowcount != 1:
+            return  # taken by another process, or no longer queued
+
+        job = await db.get(ChatJob, job_id)
+        message = await db.get(ChatMessage, job.message_id)
+        user_id = job.user_id
+        error: Optional[str] = None
+        try:
+            # Same per-user single-flight as /chat, but a queued job waits its turn instead of
+            # being rejected; the context is loaded once the user's previous turn is saved
+            async with llm_limiter.slot(user_id, single_flight="wait", timeout=_admission_timeout()):
+                profile, shortlists = await load_chat_context(db, user_id)
+                response_text, actions = await invoke_counsellor(
+                    db, user_id, message.content, profile, shortlists,
+                    route=JOB_ROUTE, history_before=message.created_at,
+                )
+                # Job result, reply and actions commit together (before the user's next turn starts)
+                job.status = "done"
+                job.result = {"message": response_text, "actions": actions if actions else None}
+                await save_turn(
+                    db, user_id, message.content, message.created_at, response_text, actions,
+                    {s.id for s in shortlists}, route=JOB_ROUTE, user_message_saved=True,
+                )
+        except LLMLimitExceeded as e:
+            # Not admitted yet (the user's previous turn or the global queue is still busy):
+            # the job waits its turn again instead of failing
+            await db.rollback()
+            await db.execute(
+                update(ChatJob)
+                .where(ChatJob.id == job_id, ChatJob.status == "running")
+                .values(status="queued", updated_at=datetime.now(timezone.utc))
+            )
+            await db.commit()
+            print(f"[DEBUG] Chat job {job_id} not admitted ({e.detail}); re-queued")
+            asyncio.get_running_loop().call_later(e.retry_after, enqueue, job_id)
+            return
+        except Exception as e:
+            print(f"[DEBUG] Chat job {job_id} failed: {e!r}")
+            error = "Something went wrong while generating the reply. Please try again."
+        if error is not None:
+            await db.rollback()
+            await db.execute(update(ChatJob).where(ChatJob.id == job_id).values(status="failed", error=error))
+            await db.commit()
+            return
+    await refresh_conversation_summary(user_id)
@@ -1,12 +1,13 @@
-"""AI Counsellor using Google Gemini 2026 SDK."""
-import json
-import re
-from typing import Optional, List, Any
+"""AI Counsellor on Google Gemini (or the local fake backend, see services.llm)."""
+import asyncio
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Optional, List, Any, AsyncIterator
 
-# Updated import
-from google import genai
 from google.genai import types
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from config import settings
 from models.profile import Profile
@@ -14,9 +15,49 @@ from models.university import UniversityShortlist
 from models.todo import Todo
 from models.chat import ChatMessage
 from services.stage import get_stage, get_stage_label
+from services.versioning import bump_data_version_async
+from services import chat_history
+from services.actions import extract_actions
+from services.amounts import parse_acceptance_pct, parse_cost_inr
+from services.llm import LLMResult, backend as llm  # Gemini or the local fake, per LLM_BACKEND
+from services.llm_limits import llm_limiter
+from services.metrics import observe_stage, record_llm_tokens, stage_timer
+from services.resilience import CircuitBreaker, CircuitOpenError, call_with_retries
+from database import AsyncSessionLocal
 
-# Initialize the global client - it picks up GEMINI_API_KEY from env automatically
-client = genai.Client(api_key=settings.gemini_api_key)
+MODEL_NAME = "gemini-2.5-flash"
+FALLBACK_REPLY = "I'm having trouble connecting to my AI core. Please try again in a moment."
+# Served without calling the model while the circuit breaker is open
+DEGRADED_REPLY = (
+    "The AI counsellor is temporarily unavailable. Your profile, shortlist and tasks are all "
+    "still available - please try chatting again in a minute."
+)
+
+llm_breaker = CircuitBreaker(
+    llm.name,
+    failure_threshold=settings.llm_breaker_failure_threshold,
+    reset_timeout=settings.llm_breaker_reset_seconds,
+)
+
+async def _call_llm(fn):
+    """Run an LLM coroutine factory under the request budget, retry policy and breaker."""
+    return await call_with_retries(
+        fn,
+        breaker=llm_breaker,
+        budget=settings.llm_request_budget_seconds,
+        attempt_timeout=settings.llm_attempt_timeout_seconds,
+        max_attempts=settings.llm_max_attempts,
+        base_delay=settings.llm_retry_base_delay_seconds,
+    )
+
+# Provider-side cached content for the static prompt, keyed by PROMPT_VERSION:
+# {version: {"name": str | None, "expires_at": float, "retry_at": float}}
+_prompt_caches: dict[str, dict] = {}
+_prompt_cache_lock = asyncio.Lock()
+# Don't hammer the caching API when it is unavailable (quota, unsupported model, ...)
+PROMPT_CACHE_RETRY_SECONDS = 300
+# Lookup/creation runs under _prompt_cache_lock with every chat waiting on it: give up quickly
+PROMPT_CACHE_CREATE_TIMEOUT_SECONDS = 5.0
 
 def _profile_context(profile: Optional[Profile]) -> str:
     if not profile:
@@ -99,16 +140,12 @@ def _shortlist_context(shortlists: List[UniversityShortlist]) -> str:
         lines.append(f"- {s.name} ({s.country}) category={s.category} locked={s.locked}")
     return "\n".join(lines)
 
-def build_system_prompt(profile: Optional[Profile], shortlists: List[UniversityShortlist], stage: int) -> str:
-    stage_label = get_stage_label(stage)
-    return f"""You are an AI Counsellor for study-abroad. You guide students from profile building to university shortlisting and application prep.
-Current user stage: {stage} – {stage_label}.
-
-User profile:
-{_profile_context(profile)}
+# Bump whenever STATIC_SYSTEM_PROMPT changes so a fresh provider-side cache is registered.
+PROMPT_VERSION = "1"
 
-Shortlisted/locked universities:
-{_shortlist_context(shortlists)}
+# Instructions shared by every user and turn. Built once; sent via Gemini context caching when available.
+STATIC_SYSTEM_PROMPT = """You are an AI Counsellor for study-abroad. You guide students from profile building to university shortlisting and application prep.
+The current user's stage, profile and shortlist are provided separately as "User context".
 
 CRITICAL: When recommending universities with shortlist_add action, ALWAYS include COMPLETE details with ACTUAL UNIVERSITY-SPECIFIC DATA:
 - name: Full official university name (e.g., "Massachusetts Institute of Technology")
@@ -161,16 +198,16 @@ IMPORTANT INSTRUCTIONS:
 8. Always provide helpful advice and guidance in your response.
 
 ACTIONS FORMAT:
-ACTIONS: [{{JSON_ARRAY_HERE}}]
+ACTIONS: [{JSON_ARRAY_HERE}]
 
 EXAMPLE 1 - MIT (ACTUAL SPECIFIC UNIVERSITY DATA - Research conducted):
-ACTIONS: [{{"type": "shortlist_add", "name": "Massachusetts Institute of Technology", "country": "United States", "domain": "mit.edu", "web_page": "https://www.mit.edu", "category": "dream", "cost_level": "₹32,50,000", "acceptance_chance": "3.3%", "fit_reason": "World-leading institution in computer science and AI/ML research. Exceptional faculty and cutting-edge laboratories. Perfect match for your MS CS aspirations and research interest.", "risks": "Extremely competitive with 3.3% acceptance rate. Requires 170+ GRE, TOEFL 110+, strong publications or research experience, exceptional letters of recommendation, and compelling SOP."}}]
+ACTIONS: [{"type": "shortlist_add", "name": "Massachusetts Institute of Technology", "country": "United States", "domain": "mit.edu", "web_page": "https://www.mit.edu", "category": "dream", "cost_level": "₹32,50,000", "acceptance_chance": "3.3%", "fit_reason": "World-leading institution in computer science and AI/ML research. Exceptional faculty and cutting-edge laboratories. Perfect match for your MS CS aspirations and research interest.", "risks": "Extremely competitive with 3.3% acceptance rate. Requires 170+ GRE, TOEFL 110+, strong publications or research experience, exceptional letters of recommendation, and compelling SOP."}]
 
 EXAMPLE 2 - TU MUNICH (ACTUAL SPECIFIC UNIVERSITY DATA - Research conducted):
-ACTIONS: [{{"type": "shortlist_add", "name": "Technical University of Munich (TUM)", "country": "Germany", "domain": "tum.de", "web_page": "https://www.tum.de/en/", "category": "target", "cost_level": "₹8,50,000", "acceptance_chance": "22%", "fit_reason": "Top-ranked European university for engineering and computer science. Much lower cost than US/UK while maintaining world-class education. Strong industry partnerships and excellent placement record.", "risks": "Some programs taught in German - ensure English-taught tracks. Moderate competition (22% acceptance). Requires strong academic background and minimum B2 German proficiency for some programs."}}]
+ACTIONS: [{"type": "shortlist_add", "name": "Technical University of Munich (TUM)", "country": "Germany", "domain": "tum.de", "web_page": "https://www.tum.de/en/", "category": "target", "cost_level": "₹8,50,000", "acceptance_chance": "22%", "fit_reason": "Top-ranked European university for engineering and computer science. Much lower cost than US/UK while maintaining world-class education. Strong industry partnerships and excellent placement record.", "risks": "Some programs taught in German - ensure English-taught tracks. Moderate competition (22% acceptance). Requires strong academic background and minimum B2 German proficiency for some programs."}]
 
 EXAMPLE 3 - UNIVERSITY OF TORONTO (ACTUAL SPECIFIC UNIVERSITY DATA - Research conducted):
-ACTIONS: [{{"type": "shortlist_add", "name": "University of Toronto", "country": "Canada", "domain": "utoronto.ca", "web_page": "https://www.utoronto.ca", "category": "target", "cost_level": "₹19,50,000", "acceptance_chance": "15%", "fit_reason": "Canada's leading university with excellent CS programs. More affordable than US while maintaining top-tier quality. Good balance of competitiveness and value. Strong tech industry connections.", "risks": "Competitive admission (15% acceptance). Requires strong GRE/GMAT and TOEFL. Canadian student visa requirements apply. Program-specific GPA and test score cutoffs may apply."}}]
+ACTIONS: [{"type": "shortlist_add", "name": "University of Toronto", "country": "Canada", "domain": "utoronto.ca", "web_page": "https://www.utoronto.ca", "category": "target", "cost_level": "₹19,50,000", "acceptance_chance": "15%", "fit_reason": "Canada's leading university with excellent CS programs. More affordable than US while maintaining top-tier quality. Good balance of competitiveness and value. Strong tech industry connections.", "risks": "Competitive admission (15% acceptance). Requires strong GRE/GMAT and TOEFL. Canadian student visa requirements apply. Program-specific GPA and test score cutoffs may apply."}]
 
 You must:
 - Answer based on their profile and stage.
@@ -185,72 +222,391 @@ You must:
 
 Allowed ACTIONS: shortlist_add (all fields required including web_page), lock (shortlist_id), todo_add (title required, others optional)."""
 
+def build_user_context(
+    profile: Optional[Profile],
+    shortlists: List[UniversityShortlist],
+    stage: int,
+    conversation_summary: Optional[str] = None,
+) -> str:
+    """Per-user part of the system prompt (changes from turn to turn)."""
+    stage_label = get_stage_label(stage)
+    summary_section = ""
+    if conversation_summary:
+        summary_section = f"\n\nSummary of the earlier conversation:\n{conversation_summary}"
+    return f"""User context:
+Current user stage: {stage} – {stage_label}.
+
+User profile:
+{_profile_context(profile)}
+
+Shortlisted/locked universities:
+{_shortlist_context(shortlists)}{summary_section}"""
+
+def build_system_prompt(
+    profile: Optional[Profile],
+    shortlists: List[UniversityShortlist],
+    stage: int,
+    conversation_summary: Optional[str] = None,
+) -> str:
+    """Full inline system prompt, used when the static prefix is not cached."""
+    return STATIC_SYSTEM_PROMPT + "\n\n" + build_user_context(profile, shortlists, stage, conversation_summary)
+
 def parse_actions(text: str) -> List[dict]:
-    # Look for ACTIONS: [...] anywhere in the response, not just at the end
-    match = re.search(r"ACTIONS:\s*(\[.*\])", text, re.DOTALL)
-    if not match:
-        print(f"[DEBUG] No ACTIONS found in response")
-        return []
-    try:
-        actions_json = match.group(1)
-        print(f"[DEBUG] Parsed ACTIONS: {actions_json}")
-        return json.loads(actions_json)
-    except json.JSONDecodeError as e:
-        print(f"[DEBUG] Failed to parse ACTIONS JSON: {e}. Raw: {match.group(1)}")
-        return []
+    """All actions from every ACTIONS block in ``text``."""
+    return extract_actions(text)[1]
 
 def strip_actions_from_response(text: str) -> str:
-    # Remove the ACTIONS: [...] block from anywhere in the response
-    return re.sub(r"\s*ACTIONS:\s*\[.*?\]\s*", "", text, flags=re.DOTALL).strip()
-
-def get_chat_history_for_sdk(db: Session, user_id: str, limit: int = 20) -> List[types.Content]:
-    rows = (
-        db.query(ChatMessage)
-        .filter(ChatMessage.user_id == user_id)
-        .order_by(ChatMessage.created_at.desc())
-        .limit(limit)
-        .all()
-    )
+    """``text`` with every ACTIONS block removed."""
+    return extract_actions(text)[0]
+
+async def get_chat_history_for_sdk(
+    db: AsyncSession,
+    user_id: str,
+    before: Optional[datetime] = None,
+) -> tuple[Optional[str], List[types.Content]]:
+    """Rolling summary of older turns (if any) plus the recent turns as SDK contents."""
+    summary = await chat_history.get_summary(db, user_id)
+    rows = await chat_history.load_recent_messages(db, user_id, summary, before)
     # The new SDK uses types.Content objects
     history = []
-    for r in reversed(rows):
+    for r in rows:
         role = "user" if r.role == "user" else "model"
         history.append(types.Content(role=role, parts=[types.Part.from_text(text=r.content)]))
-    return history
+    return (summary.summary if summary and summary.summary else None), history
+
+SUMMARY_INSTRUCTION = """You maintain a running summary of a study-abroad counselling chat between a student and their counsellor.
+Merge the new messages into the existing summary. Keep the student's goals, constraints, decisions, universities discussed (with category, cost and acceptance when stated) and open next steps.
+Drop greetings and repeated advice. Reply with the updated summary only, in plain text, at most {max_words} words."""
+
+# Users whose summary is being refreshed in this process (avoid folding the same turns twice)
+_summaries_in_progress: set[str] = set()
+
+async def refresh_conversation_summary(user_id: str) -> None:
+    """Fold turns that fell out of the recent window into the user's rolling summary.
+
+    Runs after the reply has been sent (background task) with its own session, so it never
+    adds to chat latency. Only messages newer than the previous watermark are summarized.
+    """
+    if user_id in _summaries_in_progress:
+        return
+    _summaries_in_progress.add(user_id)
+    try:
+        async with AsyncSessionLocal() as db:
+            summary = await chat_history.get_summary(db, user_id)
+            to_fold = await chat_history.load_messages_to_fold(db, user_id, summary)
+            await db.commit()  # release the connection while the model summarizes
+            if not to_fold:
+                return
+            previous = summary.summary if summary and summary.summary else "(none yet)"
+            prompt = f"Existing summary:\n{previous}\n\nNew messages:\n{chat_history.format_for_summary(to_fold)}"
+            config = types.GenerateContentConfig(
+                system_instruction=SUMMARY_INSTRUCTION.format(max_words=settings.chat_summary_max_words),
+                temperature=0.2,
+            )
+            async with llm_limiter.slot():
+                response = await _call_llm(lambda: llm.generate(MODEL_NAME, prompt, config))
+            record_llm_tokens("summary", response.prompt_tokens, response.output_tokens)
+            text = (response.text or "").strip()
+            if not text:
+                return
+            await chat_history.save_summary(db, user_id, summary, text, to_fold[-1].created_at)
+            print(f"[DEBUG] Folded {len(to_fold)} messages into summary for user {user_id}")
+    except Exception as e:
+        print(f"[DEBUG] Conversation summary refresh failed for {user_id}: {e}")
+    finally:
+        _summaries_in_progress.discard(user_id)
+
+async def load_chat_context(db: AsyncSession, user_id: str) -> tuple[Optional[Profile], List[UniversityShortlist]]:
+    profile = (await db.execute(select(Profile).where(Profile.user_id == user_id))).scalars().first()
+    shortlists = (await db.execute(
+        select(UniversityShortlist).where(UniversityShortlist.user_id == user_id)
+    )).scalars().all()
+    # End the read transaction: the connection goes back to the pool while the caller waits for
+    # admission and the model (expire_on_commit=False keeps the loaded rows usable)
+    await db.commit()
+    return profile, list(shortlists)
+
+async def save_turn(
+    db: AsyncSession,
+    user_id: str,
+    user_message: str,
+    user_sent_at: datetime,
+    response_text: str,
+    actions: List[dict],
+    shortlist_ids: set[str],
+    route: str = "/counsellor/chat",
+    user_message_saved: bool = False,
+) -> List[dict]:
+    """Persist a whole chat turn in one transaction: both messages plus the executed actions.
+
+    ``shortlist_ids`` are the user's existing shortlist IDs (already loaded for the prompt), so
+    validating todo_add/lock targets needs no per-action lookup. New rows go in with one flush
+    (batched INSERTs per table) and locks with a single UPDATE. Returns the executed summary.
+    With ``user_message_saved`` (chat jobs) only the reply and actions are written.
+    """
+    started = time.perf_counter()
+    executed = []
+    new_rows = []
+    lock_ids: List[str] = []
+    for a in actions:
+        t = a.get("type")
+        print(f"[DEBUG] Executing action type: {t}, data: {a}")
+        if t == "shortlist_add":
+            name = a.get("name") or "Unknown"
+            country = a.get("country") or "Unknown"
+            # Extract all fields with defaults
+            domain = a.get("domain")
+            category = a.get("category") or "target"  # default to target if not specified
+            cost_level = a.get("cost_level")
+            acceptance_chance = a.get("acceptance_chance")
+            fit_reason = a.get("fit_reason") or f"Recommended for {country}"
+            risks = a.get("risks") or "Standard competitive admission"
+            
+            print(f"[DEBUG] Adding university: name={name}, country={country}, domain={domain}, category={category}, cost={cost_level}, acceptance={acceptance_chance}")
+            
+            rec = UniversityShortlist(
+                id=str(uuid.uuid4()),
+                user_id=user_id,
+                name=name,
+                country=country,
+                domain=domain,
+                web_page=a.get("web_page"),  # Include web_page if provided
+                category=category,
+                cost_level=cost_level,
+                acceptance_chance=acceptance_chance,
+                annual_cost_inr=parse_cost_inr(cost_level),
+                acceptance_pct=parse_acceptance_pct(acceptance_chance),
+                fit_reason=fit_reason,
+                risks=risks,
+            )
+            new_rows.append(rec)
+            executed.append({"type": "shortlist_add", "name": name, "country": country, "category": category})
+            print(f"[DEBUG] University queued for DB save: fit_reason={fit_reason}, risks={risks}, domain={domain}")
+        elif t == "todo_add":
+            title = a.get("title") or "Task"
+            shortlist_id = a.get("shortlist_id")
+            # Validate shortlist_id belongs to user if provided
+            if shortlist_id and shortlist_id not in shortlist_ids:
+                shortlist_id = None  # Discard invalid shortlist_id
+            todo = Todo(
+                id=str(uuid.uuid4()),
+                user_id=user_id,
+                shortlist_id=shortlist_id,
+                title=title,
+                category=a.get("category"),
+            )
+            new_rows.append(todo)
+            executed.append({"type": "todo_add", "title": title, "shortlist_id": shortlist_id})
+        elif t == "lock" and a.get("shortlist_id") in shortlist_ids:
+            if a["shortlist_id"] not in lock_ids:
+                lock_ids.append(a["shortlist_id"])
+                executed.append({"type": "lock", "shortlist_id": a["shortlist_id"]})
+
+    rows: List[Any] = []
+    if not user_message_saved:
+        rows.append(ChatMessage(
+            id=str(uuid.uuid4()),
+            user_id=user_id,
+            role="user",
+            content=user_message,
+            created_at=user_sent_at,
+        ))
+    rows.extend(new_rows)
+    # Save assistant message with full action details for frontend
+    rows.append(ChatMessage(
+        id=str(uuid.uuid4()),
+        user_id=user_id,
+        role="assistant",
+        content=response_text,
+        actions=actions if actions else None,  # Store full actions with all details
+        created_at=datetime.now(timezone.utc),
+    ))
+    db.add_all(rows)
+    if lock_ids:
+        await db.execute(
+            update(UniversityShortlist)
+            .where(UniversityShortlist.user_id == user_id, UniversityShortlist.id.in_(lock_ids))
+            .values(locked=True)
+        )
+    # Messages and actions change history, todos and shortlist: invalidate the user's ETags
+    await bump_data_version_async(db, user_id)
+    observe_stage(route, "action_execute", time.perf_counter() - started)
+    with stage_timer(route, "commit"):
+        await db.commit()
+    print(f"[DEBUG] Turn committed. Executed: {executed}")
+    return executed
+
+async def _cached_prompt_name() -> Optional[str]:
+    """Name of the cached content holding STATIC_SYSTEM_PROMPT, reusing or creating it as needed.
+
+    Returns None when caching is disabled or unavailable; callers then send the prompt inline.
+    """
+    if not settings.gemini_context_cache:
+        return None
+    entry = _prompt_caches.get(PROMPT_VERSION)
+    now = time.monotonic()
+    if entry and entry["name"] and now < entry["expires_at"]:
+        return entry["name"]
+    if entry and now < entry["retry_at"]:
+        return None
+
+    async with _prompt_cache_lock:
+        entry = _prompt_caches.get(PROMPT_VERSION)
+        now = time.monotonic()
+        if entry and entry["name"] and now < entry["expires_at"]:
+            return entry["name"]
+        if entry and now < entry["retry_at"]:
+            return None  # the call we queued behind just failed
+        ttl = settings.gemini_context_cache_ttl_seconds
+        try:
+            # One attempt under a short deadline and the breaker; a timeout falls back to inline
+            cache_name, lifetime = await call_with_retries(
+                lambda: llm.get_or_create_prompt_cache(
+                    MODEL_NAME, STATIC_SYSTEM_PROMPT, f"counsellor-system-prompt-v{PROMPT_VERSION}", ttl,
+                ),
+                breaker=llm_breaker,
+                budget=PROMPT_CACHE_CREATE_TIMEOUT_SECONDS,
+                attempt_timeout=PROMPT_CACHE_CREATE_TIMEOUT_SECONDS,
+                max_attempts=1,
+                base_delay=0,
+            )
+        except Exception as e:
+            print(f"[DEBUG] Context caching unavailable, sending prompt inline: {e!r}")
+            _prompt_caches[PROMPT_VERSION] = {"name": None, "expires_at": 0.0, "retry_at": now + PROMPT_CACHE_RETRY_SECONDS}
+            return None
+        # Renew a minute early so a request never references an expired cache
+        _prompt_caches[PROMPT_VERSION] = {"name": cache_name, "expires_at": now + max(lifetime - 60, 0), "retry_at": 0.0}
+        return cache_name
 
-def invoke_counsellor(
-    db: Session,
+def _invalidate_prompt_cache() -> None:
+    _prompt_caches.pop(PROMPT_VERSION, None)
+
+async def _prepare_request(
+    db: AsyncSession,
     user_id: str,
     user_message: str,
     profile: Optional[Profile],
     shortlists: List[UniversityShortlist],
-) -> tuple[str, List[dict]]:
+    route: str,
+    history_before: Optional[datetime] = None,
+) -> tuple[List[types.Content], types.GenerateContentConfig]:
     stage = get_stage(profile, len(shortlists), sum(1 for s in shortlists if s.locked))
-    system_instruction = build_system_prompt(profile, shortlists, stage)
-    
-    # 1. Fetch history in new format
-    history = get_chat_history_for_sdk(db, user_id)
-    
-    # 2. Add current message to history for this request
-    history.append(types.Content(role="user", parts=[types.Part.from_text(text=user_message)]))
 
-    try:
-        # 3. Use the unified generate_content method
-        response = client.models.generate_content(
-            model='gemini-2.5-flash',
-            contents=history,
-            config=types.GenerateContentConfig(
-                system_instruction=system_instruction,
+    # 1. Fetch history in new format (rolling summary + recent turns)
+    with stage_timer(route, "history_load"):
+        conversation_summary, history = await get_chat_history_for_sdk(db, user_id, history_before)
+        await db.commit()  # don't sit idle in transaction on a pooled connection during the LLM call
+
+    with stage_timer(route, "prompt_build"):
+        user_context = build_user_context(profile, shortlists, stage, conversation_summary)
+        cached_name = await _cached_prompt_name()
+        if cached_name:
+            # A cached system instruction can't be combined with another one, so the per-user
+            # context rides along with the current message instead.
+            history.append(types.Content(role="user", parts=[
+                types.Part.from_text(text=user_context),
+                types.Part.from_text(text=user_message),
+            ]))
+            config = types.GenerateContentConfig(cached_content=cached_name, temperature=0.7)
+        else:
+            # 2. Add current message to history for this request
+            history.append(types.Content(role="user", parts=[types.Part.from_text(text=user_message)]))
+            config = types.GenerateContentConfig(
+                system_instruction=build_system_prompt(profile, shortlists, stage, conversation_summary),
                 temperature=0.7
             )
-        )
+    return history, config
+
+async def invoke_counsellor(
+    db: AsyncSession,
+    user_id: str,
+    user_message: str,
+    profile: Optional[Profile],
+    shortlists: List[UniversityShortlist],
+    route: str = "/counsellor/chat",
+    history_before: Optional[datetime] = None,
+) -> tuple[str, List[dict]]:
+    """Reply text and actions for ``user_message``.
+
+    Pass ``history_before`` when the user message is already stored (chat jobs) so it isn't
+    sent twice.
+    """
+    history, config = await _prepare_request(
+        db, user_id, user_message, profile, shortlists, route, history_before,
+    )
+
+    try:
+        # 3. Async backend call: the event loop stays free while the model generates
+        with stage_timer(route, "llm_call"):
+            response = await _call_llm(lambda: llm.generate(MODEL_NAME, history, config))
+        record_llm_tokens(route, response.prompt_tokens, response.output_tokens)
         
         response_text = (response.text or "").strip()
         print(f"[DEBUG] Full AI response:\n{response_text}\n")
-        actions = parse_actions(response_text)
-        response_text = strip_actions_from_response(response_text)
+        with stage_timer(route, "action_parse"):
+            response_text, actions = extract_actions(response_text)
+        print(f"[DEBUG] Parsed ACTIONS: {actions}")
         return response_text, actions
 
+    except CircuitOpenError:
+        return DEGRADED_REPLY, []
+    except Exception as e:
+        print(f"LLM API Error: {e!r}")
+        if config.cached_content:
+            _invalidate_prompt_cache()
+        return FALLBACK_REPLY, []
+
+async def stream_counsellor(
+    db: AsyncSession,
+    user_id: str,
+    user_message: str,
+    profile: Optional[Profile],
+    shortlists: List[UniversityShortlist],
+    route: str = "/counsellor/chat/stream",
+) -> AsyncIterator[str]:
+    """Yield raw reply text chunks as the model produces them (ACTIONS block included).
+
+    Opening the stream (up to the first chunk) is retried like a normal call; after that each
+    chunk must arrive within the per-attempt timeout, since a half-sent reply can't be retried.
+    """
+    history, config = await _prepare_request(db, user_id, user_message, profile, shortlists, route)
+
+    async def open_stream():
+        stream = llm.stream(MODEL_NAME, history, config).__aiter__()
+        try:
+            first = await stream.__anext__()
+        except StopAsyncIteration:
+            first = None
+        return stream, first
+
+    produced = False
+    usage: Optional[LLMResult] = None  # latest chunk with usage; counts are cumulative
+    started = time.perf_counter()
+    try:
+        stream, chunk = await _call_llm(open_stream)
+        observe_stage(route, "llm_first_chunk", time.perf_counter() - started)
+        while chunk is not None:
+            if chunk.prompt_tokens is not None or chunk.output_tokens is not None:
+                usage = chunk
+            text = chunk.text or ""
+            if text:
+                produced = True
+                yield text
+            try:
+                chunk = await asyncio.wait_for(stream.__anext__(), settings.llm_attempt_timeout_seconds)
+            except StopAsyncIteration:
+                chunk = None
+        observe_stage(route, "llm_call", time.perf_counter() - started)
+    except CircuitOpenError:
+        yield DEGRADED_REPLY
     except Exception as e:
-        print(f"Gemini API Error: {e}")
-        return "I'm having trouble connecting to my AI core. Please try again in a moment.", []
\ No newline at end of file
+        print(f"LLM API Error (stream): {e!r}")
+        if produced and isinstance(e, asyncio.TimeoutError):
+            llm_breaker.record_failure()  # stalled mid-stream (open failures are already counted)
+        if config.cached_content:
+            _invalidate_prompt_cache()
+        if not produced:
+            yield FALLBACK_REPLY
+    finally:
+        if usage is not None:
+            record_llm_tokens(route, usage.prompt_tokens, usage.output_tokens)
@@ -0,0 +1,67 @@
+"""Process-wide pooled HTTP client for outbound calls (opened and closed in ``main.lifespan``).
+
+One ``httpx.AsyncClient`` keeps connections (TCP, TLS, DNS) alive across requests instead of
+paying the setup on every call. The Gemini SDK manages its own long-lived client.
+"""
+from typing import Optional
+
+import httpx
+
+from config import settings
+from services.metrics import HTTP_POOL_CONNECTIONS
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _new_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(
+            settings.http_timeout_seconds,
+            connect=settings.http_connect_timeout_seconds,
+        ),
+        limits=httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry_seconds,
+        ),
+        headers={"User-Agent": "ai-counsellor/0.1"},
+    )
+
+
+async def start() -> None:
+    global _client
+    if _client is None:
+        _client = _new_client()
+
+
+async def close() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """The shared client; created on first use outside the app (scripts, benchmarks)."""
+    global _client
+    if _client is None:
+        _client = _new_client()
+    return _client
+
+
+def pool_stats() -> dict:
+    """Connection counts from the transport's pool (idle = kept alive, ready for reuse)."""
+    stats = {"open": 0, "idle": 0, "active": 0, "max_connections": settings.http_max_connections}
+    # httpx doesn't expose the pool publicly; read httpcore's connection list defensively
+    pool = getattr(getattr(_client, "_transport", None), "_pool", None)
+    for conn in list(getattr(pool, "connections", None) or []):
+        stats["open"] += 1
+        try:
+            stats["idle" if conn.is_idle() else "active"] += 1
+        except Exception:
+            stats["active"] += 1
+    return stats
+
+
+HTTP_POOL_CONNECTIONS.labels(state="idle").set_function(lambda: pool_stats()["idle"])
+HTTP_POOL_CONNECTIONS.labels(state="active").set_function(lambda: pool_stats()["active"])
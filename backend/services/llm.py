@@ -0,0 +1,181 @@
+"""LLM backends behind the counsellor: Gemini, and a deterministic in-process fake.
+
+Selected by ``settings.llm_backend``. The fake needs no network or API key and has
+configurable latency, streaming cadence and ACTIONS payload, so the chat path (DB, prompt
+build, action execution) can be load-tested and benchmarked without the provider.
+"""
+import asyncio
+import hashlib
+import json
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import AsyncIterator, List, Optional
+
+from google import genai
+from google.genai import types
+
+from config import settings
+
+
+@dataclass
+class LLMResult:
+    """A reply, or one streamed chunk of it. Token counts are set when the backend reports them.
+
+    On streamed chunks the counts are cumulative for the reply so far (as Gemini reports
+    ``usage_metadata``), so only the last chunk's counts should be recorded.
+    """
+    text: str
+    prompt_tokens: Optional[int] = None
+    output_tokens: Optional[int] = None
+
+
+# A cache found by name is only reused if it outlives a few requests; otherwise a fresh one is made
+MIN_REUSED_CACHE_SECONDS = 300
+
+
+class LLMBackend(ABC):
+    """What the counsellor needs from a model provider; a backend missing a method can't be created."""
+    name = "base"
+
+    @abstractmethod
+    async def generate(self, model: str, contents, config: types.GenerateContentConfig) -> LLMResult:
+        ...
+
+    @abstractmethod
+    def stream(self, model: str, contents, config: types.GenerateContentConfig) -> AsyncIterator[LLMResult]:
+        ...
+
+    @abstractmethod
+    async def get_or_create_prompt_cache(
+        self, model: str, system_instruction: str, display_name: str, ttl_seconds: int,
+    ) -> tuple[str, float]:
+        """Name and remaining lifetime (seconds) of the cached content holding ``system_instruction``.
+
+        ``display_name`` identifies the prompt version: an existing, unexpired cache with that name
+        is reused (other workers, earlier runs), so each version is registered once.
+        """
+
+
+def _usage(response) -> tuple[Optional[int], Optional[int]]:
+    usage = getattr(response, "usage_metadata", None)
+    if not usage:
+        return None, None
+    return usage.prompt_token_count, usage.candidates_token_count
+
+
+class GeminiBackend(LLMBackend):
+    name = "gemini"
+
+    def __init__(self, api_key: str):
+        self.client = genai.Client(api_key=api_key)
+
+    async def generate(self, model, contents, config):
+        response = await self.client.aio.models.generate_content(model=model, contents=contents, config=config)
+        prompt_tokens, output_tokens = _usage(response)
+        return LLMResult((response.text or ""), prompt_tokens, output_tokens)
+
+    async def stream(self, model, contents, config):
+        async for chunk in await self.client.aio.models.generate_content_stream(
+            model=model, contents=contents, config=config,
+        ):
+            prompt_tokens, output_tokens = _usage(chunk)
+            yield LLMResult(chunk.text or "", prompt_tokens, output_tokens)
+
+    async def get_or_create_prompt_cache(self, model, system_instruction, display_name, ttl_seconds):
+        now = datetime.now(timezone.utc)
+        async for existing in await self.client.aio.caches.list(config=types.ListCachedContentsConfig(page_size=100)):
+            if existing.display_name != display_name or not (existing.model or "").endswith(model):
+                continue
+            remaining = (existing.expire_time - now).total_seconds() if existing.expire_time else 0.0
+            if remaining > MIN_REUSED_CACHE_SECONDS:
+                return existing.name, remaining
+        cache = await self.client.aio.caches.create(
+            model=model,
+            config=types.CreateCachedContentConfig(
+                display_name=display_name,
+                system_instruction=system_instruction,
+                ttl=f"{ttl_seconds}s",
+            ),
+        )
+        return cache.name, float(ttl_seconds)
+
+
+FAKE_REPLIES = [
+    "Based on your profile, a balanced shortlist across dream, target and safe universities is the "
+    "right next step. Focus on finishing your English test and a first SOP draft this month.",
+    "Your academics look solid for target programs. Strengthen your application with a research "
+    "project or internship, and request letters of recommendation early.",
+    "Consider adding a safe option in a lower-cost country to keep within your budget, and check "
+    "scholarship deadlines for each university you lock.",
+]
+
+
+class FakeBackend(LLMBackend):
+    """Canned, deterministic replies (chosen by a hash of the last user message)."""
+    name = "fake"
+
+    def __init__(self, latency_ms: int, chunk_interval_ms: int, chunk_chars: int, actions_json: str):
+        self.latency = latency_ms / 1000
+        self.chunk_interval = chunk_interval_ms / 1000
+        self.chunk_chars = max(1, chunk_chars)
+        self.actions = json.loads(actions_json) if actions_json else []
+
+    def _reply(self, contents) -> str:
+        last = ""
+        if isinstance(contents, str):
+            last = contents
+        elif contents:
+            last = " ".join(p.text or "" for p in (contents[-1].parts or []))
+        idx = int(hashlib.sha1(last.encode()).hexdigest(), 16) % len(FAKE_REPLIES)
+        text = FAKE_REPLIES[idx]
+        if self.actions:
+            text += "\n\nACTIONS: " + json.dumps(self.actions, ensure_ascii=False)
+        return text
+
+    @staticmethod
+    def _prompt_tokens(contents, config) -> int:
+        chars = len(config.system_instruction or "") if config else 0
+        if isinstance(contents, str):
+            chars += len(contents)
+        else:
+            chars += sum(len(p.text or "") for c in contents for p in (c.parts or []))
+        return chars // 4 + 1
+
+    async def generate(self, model, contents, config):
+        text = self._reply(contents)
+        n_chunks = -(-len(text) // self.chunk_chars)
+        await asyncio.sleep(self.latency + self.chunk_interval * max(0, n_chunks - 1))
+        return LLMResult(text, self._prompt_tokens(contents, config), len(text) // 4 + 1)
+
+    async def stream(self, model, contents, config):
+        text = self._reply(contents)
+        await asyncio.sleep(self.latency)
+        pieces: List[str] = [text[i:i + self.chunk_chars] for i in range(0, len(text), self.chunk_chars)]
+        prompt_tokens = self._prompt_tokens(contents, config)
+        sent = 0
+        for i, piece in enumerate(pieces):
+            if i:
+                await asyncio.sleep(self.chunk_interval)
+            sent += len(piece)
+            # Cumulative usage on every chunk, like Gemini
+            yield LLMResult(piece, prompt_tokens, sent // 4 + 1)
+
+    async def get_or_create_prompt_cache(self, model, system_instruction, display_name, ttl_seconds):
+        return f"cachedContents/fake-{display_name}", float(ttl_seconds)
+
+
+def create_backend() -> LLMBackend:
+    if settings.llm_backend == "fake":
+        return FakeBackend(
+            latency_ms=settings.fake_llm_latency_ms,
+            chunk_interval_ms=settings.fake_llm_chunk_interval_ms,
+            chunk_chars=settings.fake_llm_chunk_chars,
+            actions_json=settings.fake_llm_actions,
+        )
+    if settings.llm_backend != "gemini":
+        raise ValueError(f"Unknown LLM_BACKEND {settings.llm_backend!r} (expected 'gemini' or 'fake')")
+    return GeminiBackend(api_key=settings.gemini_api_key)
+
+
+backend = create_backend()
@@ -0,0 +1,123 @@
+"""Admission control for LLM calls: per-user single-flight and a global concurrency cap.
+
+Limits are per process (each uvicorn worker enforces its own).
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+
+from config import settings
+
+
+class LLMLimitExceeded(Exception):
+    """Raised when a call is not admitted; routers turn it into an HTTP error with Retry-After."""
+
+    def __init__(self, status_code: int, detail: str, retry_after: int):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class LLMSlot:
+    """An admitted call. ``release()`` is idempotent so it can be wired to several exit paths."""
+
+    def __init__(self, limiter: "LLMLimiter", user_id: Optional[str]):
+        self._limiter = limiter
+        self._user_id = user_id
+        self._released = False
+
+    def release(self) -> None:
+        if self._released:
+            return
+        self._released = True
+        self._limiter._release(self._user_id)
+
+
+class LLMLimiter:
+    def __init__(self, max_concurrency: int, max_queue: int, queue_timeout: float, single_flight: str):
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._max_queue = max_queue
+        self._queue_timeout = queue_timeout
+        self._single_flight = single_flight  # "reject" or "wait"
+        self._waiting = 0
+        self._in_flight = 0
+        self._users: Dict[str, asyncio.Event] = {}
+
+    @property
+    def stats(self) -> dict:
+        return {"in_flight": self._in_flight, "waiting": self._waiting, "users_in_flight": len(self._users)}
+
+    async def acquire(
+        self,
+        user_id: Optional[str] = None,
+        single_flight: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> LLMSlot:
+        """Admit one call for ``user_id`` (None for background work such as summaries).
+
+        ``single_flight`` overrides the configured policy ("reject" or "wait") and ``timeout`` the
+        queue timeout, for this call (background jobs can afford to wait longer than a request).
+        """
+        timeout = self._queue_timeout if timeout is None else timeout
+        if user_id is not None:
+            await self._claim_user(user_id, single_flight or self._single_flight, timeout)
+        try:
+            await self._acquire_global(timeout)
+        except BaseException:
+            if user_id is not None:
+                self._users.pop(user_id).set()
+            raise
+        self._in_flight += 1
+        return LLMSlot(self, user_id)
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        user_id: Optional[str] = None,
+        single_flight: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator[LLMSlot]:
+        held = await self.acquire(user_id, single_flight, timeout)
+        try:
+            yield held
+        finally:
+            held.release()
+
+    async def _claim_user(self, user_id: str, single_flight: str, timeout: float) -> None:
+        while user_id in self._users:
+            if single_flight != "wait":
+                raise LLMLimitExceeded(409, "Your previous message is still being answered.", retry_after=2)
+            try:
+                await asyncio.wait_for(self._users[user_id].wait(), timeout)
+            except asyncio.TimeoutError:
+                raise LLMLimitExceeded(503, "Your previous message is still being answered.", retry_after=2)
+        self._users[user_id] = asyncio.Event()
+
+    async def _acquire_global(self, timeout: float) -> None:
+        retry_after = max(1, int(self._queue_timeout))
+        if self._semaphore.locked() and self._waiting >= self._max_queue:
+            raise LLMLimitExceeded(429, "The counsellor is busy right now. Please retry shortly.", retry_after)
+        self._waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout)
+        except asyncio.TimeoutError:
+            raise LLMLimitExceeded(503, "The counsellor is busy right now. Please retry shortly.", retry_after)
+        finally:
+            self._waiting -= 1
+
+    def _release(self, user_id: Optional[str]) -> None:
+        self._in_flight -= 1
+        self._semaphore.release()
+        if user_id is not None:
+            event = self._users.pop(user_id, None)
+            if event:
+                event.set()
+
+
+llm_limiter = LLMLimiter(
+    max_concurrency=settings.llm_max_concurrency,
+    max_queue=settings.llm_max_queue,
+    queue_timeout=settings.llm_queue_timeout_seconds,
+    single_flight=settings.chat_single_flight,
+)
@@ -0,0 +1,100 @@
+"""Prometheus metrics (scraped from GET /metrics).
+
+Stage latencies are histograms labelled by route and stage, so p50/p99 per stage come from
+``histogram_quantile`` on the scrape side.
+"""
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+
+__all__ = [
+    "CONTENT_TYPE_LATEST", "generate_latest", "stage_timer", "observe_stage", "record_llm_tokens",
+    "CHAT_JOB_QUEUE_DEPTH", "CACHE_REQUESTS", "CACHE_REFRESHES", "CACHE_ENTRIES",
+    "HTTP_POOL_CONNECTIONS", "PASSWORD_HASH_SECONDS", "PASSWORD_HASH_INFLIGHT", "PASSWORD_HASH_REJECTED",
+]
+
+# Chat stages range from sub-millisecond (prompt build) to tens of seconds (LLM call)
+_STAGE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 40, 60)
+_TOKEN_BUCKETS = (50, 100, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000)
+
+CHAT_STAGE_SECONDS = Histogram(
+    "chat_stage_seconds",
+    "Time spent in each stage of the counsellor chat path",
+    ["route", "stage"],
+    buckets=_STAGE_BUCKETS,
+)
+LLM_TOKENS = Histogram(
+    "llm_tokens_per_call",
+    "Prompt (input) and output tokens per LLM call, from the provider's usage metadata",
+    ["route", "direction"],
+    buckets=_TOKEN_BUCKETS,
+)
+LLM_TOKENS_TOTAL = Counter(
+    "llm_tokens",
+    "Total prompt (input) and output tokens",
+    ["route", "direction"],
+)
+CHAT_JOB_QUEUE_DEPTH = Gauge(
+    "chat_job_queue_depth",
+    "Chat jobs waiting for a worker in this process",
+)
+
+CACHE_REQUESTS = Counter(
+    "cache_requests",
+    "In-process cache lookups by result (hit, stale = served stale while refreshing, miss)",
+    ["cache", "result"],
+)
+CACHE_REFRESHES = Counter(
+    "cache_refreshes",
+    "Background stale-while-revalidate reloads by outcome",
+    ["cache", "outcome"],
+)
+CACHE_ENTRIES = Gauge(
+    "cache_entries",
+    "Entries currently held by an in-process cache",
+    ["cache"],
+)
+HTTP_POOL_CONNECTIONS = Gauge(
+    "http_pool_connections",
+    "Connections held by the shared outbound HTTP client, by state (idle keep-alive or active)",
+    ["state"],
+)
+
+PASSWORD_HASH_SECONDS = Histogram(
+    "password_hash_seconds",
+    "bcrypt hash/verify time on the password pool, including time queued for a worker",
+    ["op"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 1, 2, 5, 10),
+)
+PASSWORD_HASH_INFLIGHT = Gauge(
+    "password_hash_inflight",
+    "bcrypt calls submitted to the password pool and not yet finished",
+)
+PASSWORD_HASH_REJECTED = Counter(
+    "password_hash_rejected",
+    "bcrypt calls refused because the password pool queue was full",
+    ["op"],
+)
+
+
+def observe_stage(route: str, stage: str, seconds: float) -> None:
+    CHAT_STAGE_SECONDS.labels(route=route, stage=stage).observe(seconds)
+
+
+@contextmanager
+def stage_timer(route: str, stage: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(route, stage, time.perf_counter() - start)
+
+
+def record_llm_tokens(route: str, prompt_tokens: Optional[int], output_tokens: Optional[int]) -> None:
+    for direction, count in (("input", prompt_tokens), ("output", output_tokens)):
+        if count is None:
+            continue
+        LLM_TOKENS.labels(route=route, direction=direction).observe(count)
+        LLM_TOKENS_TOTAL.labels(route=route, direction=direction).inc(count)
@@ -0,0 +1,110 @@
+"""Password hashing off the event loop, on a dedicated bcrypt process pool.
+
+bcrypt is pure CPU (hundreds of ms at cost 12). Running it on FastAPI's shared threadpool
+holds the GIL and slows every other endpoint during a login storm, so hashes are computed in
+worker processes. Work beyond ``password_hash_queue_max`` in-flight calls is rejected with
+PasswordPoolBusy (503) rather than queued without bound.
+
+``verify_and_rehash`` also upgrades hashes made with a different cost than BCRYPT_ROUNDS.
+"""
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from passlib.context import CryptContext
+
+from config import settings
+from services.metrics import PASSWORD_HASH_INFLIGHT, PASSWORD_HASH_REJECTED, PASSWORD_HASH_SECONDS
+
+
+class PasswordPoolBusy(Exception):
+    """Too many hash/verify calls in flight; routers turn it into a 503 with Retry-After."""
+
+    def __init__(self, retry_after: int = 1):
+        super().__init__("Too many sign-in attempts right now. Please try again shortly.")
+        self.detail = str(self)
+        self.retry_after = retry_after
+
+
+@lru_cache(maxsize=None)
+def _context(rounds: int) -> CryptContext:
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
+
+
+# Run in the worker processes (module-level so they pickle by reference)
+def _hash(password: str, rounds: int) -> str:
+    return _context(rounds).hash(password)
+
+
+def _warm(rounds: int) -> None:
+    _context(rounds)
+
+
+def _verify_and_update(password: str, hashed: str, rounds: int) -> Tuple[bool, Optional[str]]:
+    return _context(rounds).verify_and_update(password, hashed)
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_inflight = 0
+
+PASSWORD_HASH_INFLIGHT.set_function(lambda: _inflight)
+
+
+def _workers() -> int:
+    return settings.password_hash_workers or os.cpu_count() or 1
+
+
+def _new_pool() -> ProcessPoolExecutor:
+    # spawn, not fork: the server process has running threads and an event loop
+    return ProcessPoolExecutor(max_workers=_workers(), mp_context=multiprocessing.get_context("spawn"))
+
+
+async def start() -> None:
+    global _pool
+    if _pool is None:
+        _pool = _new_pool()
+        # Start the workers now rather than on the first login
+        await asyncio.gather(*(
+            asyncio.get_running_loop().run_in_executor(_pool, _warm, settings.bcrypt_rounds)
+            for _ in range(_workers())
+        ))
+
+
+async def close() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+async def _run(op: str, fn, *args):
+    global _pool, _inflight
+    if _inflight >= settings.password_hash_queue_max:
+        PASSWORD_HASH_REJECTED.labels(op=op).inc()
+        raise PasswordPoolBusy()
+    if _pool is None:
+        _pool = _new_pool()  # outside the app (scripts, benchmarks)
+    _inflight += 1
+    start = time.perf_counter()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_pool, fn, *args)
+    finally:
+        _inflight -= 1
+        PASSWORD_HASH_SECONDS.labels(op=op).observe(time.perf_counter() - start)
+
+
+async def hash_password(password: str) -> str:
+    return await _run("hash", _hash, password, settings.bcrypt_rounds)
+
+
+async def verify_and_rehash(password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+    """(matches, new_hash). ``new_hash`` is set when the stored hash should be replaced."""
+    return await _run("verify", _verify_and_update, password, hashed, settings.bcrypt_rounds)
+
+
+def stats() -> dict:
+    return {"workers": _workers(), "inflight": _inflight, "queue_max": settings.password_hash_queue_max}
@@ -50,3 +50,11 @@ def strength_sop(sop_status: Optional[str]) -> str:
     if "draft" in s:
         return "Draft"
     return "Not started"
+
+
+def apply_strengths(profile) -> None:
+    """Store the computed strengths on ``profile``; called wherever the profile is written."""
+    profile.strength_academics = strength_academics(profile.gpa, profile.degree_major)
+    # profile.exams is a JSON list of {name, status}
+    profile.strength_exams = strength_exams(profile.exams)
+    profile.strength_sop = strength_sop(profile.sop_status)
@@ -0,0 +1,126 @@
+"""Profile-aware ranking of recommendation candidates, scored in one vectorized NumPy pass.
+
+Each candidate gets an estimated admit chance (the university's acceptance rate shifted by the
+student's GPA) and a fit score from affordability against the profile's budget range,
+preferred-country match and admit chance. Categories are relative to the pool: the third with
+the lowest admit chance are dreams, the highest third safe bets, the rest targets. Catalog
+acceptance rates are per country, so fixed thresholds would put a whole pool in one bucket. The
+top ``k`` of each category by fit are returned.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+CATEGORIES = ("dream", "target", "safe")
+# How far a strong or weak GPA moves the admit chance (in log-odds, per unit of GPA score)
+GPA_WEIGHT = 2.0
+# GPA score assumed when the profile has none (a middling applicant)
+DEFAULT_GPA_SCORE = 0.6
+WEIGHT_AFFORDABILITY = 0.45
+WEIGHT_COUNTRY = 0.35
+WEIGHT_ADMIT = 0.20
+# Cheaper than budget_min is a weaker signal than overshooting budget_max
+UNDER_BUDGET_DECAY = 0.5
+DEFAULT_COST_INR = 1000000
+DEFAULT_ACCEPTANCE_PCT = 50
+
+
+@dataclass
+class RankingProfile:
+    budget_min: Optional[float] = None
+    budget_max: Optional[float] = None
+    gpa_score: float = DEFAULT_GPA_SCORE
+    preferred_countries: List[str] = field(default_factory=list)
+
+
+def gpa_score(gpa: Optional[str]) -> float:
+    """GPA on a 4, 10 or 100 point scale (or a percentage) mapped to 0..1."""
+    if not gpa:
+        return DEFAULT_GPA_SCORE
+    try:
+        g = float(str(gpa).replace("%", "").strip())
+    except (ValueError, TypeError):
+        return DEFAULT_GPA_SCORE
+    for scale in (4.0, 10.0, 100.0):
+        if g <= scale:
+            return max(0.0, g / scale)
+    return DEFAULT_GPA_SCORE
+
+
+def ranking_profile(profile) -> RankingProfile:
+    if profile is None:
+        return RankingProfile()
+    return RankingProfile(
+        budget_min=profile.budget_min,
+        budget_max=profile.budget_max,
+        gpa_score=gpa_score(profile.gpa),
+        preferred_countries=list(profile.preferred_countries or []),
+    )
+
+
+def candidate_arrays(candidates: Sequence[dict], preferred_countries: Sequence[str]):
+    """Annual cost (INR), acceptance rate (0..1) and country match (0/1) as float arrays."""
+    n = len(candidates)
+    cost = np.fromiter(
+        (c.get("annual_cost_inr") or DEFAULT_COST_INR for c in candidates), dtype=np.float64, count=n,
+    )
+    acceptance = np.fromiter(
+        (c.get("acceptance_pct") or DEFAULT_ACCEPTANCE_PCT for c in candidates), dtype=np.float64, count=n,
+    ) / 100.0
+    preferred = set(preferred_countries)
+    country_match = np.fromiter((c.get("country") in preferred for c in candidates), dtype=np.float64, count=n)
+    return cost, acceptance, country_match
+
+
+def score(cost: np.ndarray, acceptance: np.ndarray, country_match: np.ndarray, profile: RankingProfile):
+    """Return (admit_chance, fit, category index into CATEGORIES) for every candidate."""
+    acc = np.clip(acceptance, 0.01, 0.99)
+    logit = np.log(acc / (1.0 - acc)) + GPA_WEIGHT * (profile.gpa_score - DEFAULT_GPA_SCORE)
+    admit = 1.0 / (1.0 + np.exp(-logit))
+
+    # 1 within the budget range, decaying fast above budget_max and gently below budget_min
+    affordability = np.ones_like(cost)
+    if profile.budget_max:
+        over = np.maximum(cost - profile.budget_max, 0.0) / profile.budget_max
+        affordability *= np.exp(-2.0 * over)
+    if profile.budget_min:
+        under = np.maximum(profile.budget_min - cost, 0.0) / profile.budget_min
+        affordability *= np.exp(-UNDER_BUDGET_DECAY * under)
+
+    fit = WEIGHT_AFFORDABILITY * affordability + WEIGHT_COUNTRY * country_match + WEIGHT_ADMIT * admit
+
+    # Split into thirds by admit chance; ties keep candidate (name) order
+    n = len(admit)
+    order = np.lexsort((np.arange(n), admit))
+    position = np.empty(n, dtype=np.int64)
+    position[order] = np.arange(n)
+    category = position * len(CATEGORIES) // n
+    return admit, fit, category
+
+
+def _top_k(fit: np.ndarray, mask: np.ndarray, k: int) -> np.ndarray:
+    idx = np.flatnonzero(mask)
+    if len(idx) > k:
+        # Keep everything tied with the k-th best so the cut below is deterministic
+        kth = np.partition(-fit[idx], k - 1)[k - 1]
+        idx = idx[-fit[idx] <= kth]
+    # Best fit first, ties by original (name) order
+    return idx[np.lexsort((idx, -fit[idx]))][:k]
+
+
+def rank_candidates(candidates: Sequence[dict], profile: RankingProfile, k: int = 5) -> Dict[str, List[dict]]:
+    """Top ``k`` candidates per category, each annotated with category, fit_score and admit_chance."""
+    out: Dict[str, List[dict]] = {c: [] for c in CATEGORIES}
+    if not candidates:
+        return out
+    cost, acceptance, country_match = candidate_arrays(candidates, profile.preferred_countries)
+    admit, fit, category = score(cost, acceptance, country_match, profile)
+    for code, name in enumerate(CATEGORIES):
+        for i in _top_k(fit, category == code, k):
+            rec = candidates[i]
+            rec["category"] = name
+            rec["fit_score"] = round(float(fit[i]), 3)
+            rec["admit_chance"] = round(float(admit[i]), 3)
+            out[name].append(rec)
+    return out
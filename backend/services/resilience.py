@@ -0,0 +1,142 @@
+"""Deadlines, jittered retries and a circuit breaker for upstream calls."""
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Status codes worth retrying (rate limiting and transient server errors)
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(Exception):
+    """The upstream is considered unhealthy; the call was not attempted."""
+
+
+class CircuitBreaker:
+    """Classic closed → open → half-open breaker.
+
+    After ``failure_threshold`` consecutive failures the breaker opens and rejects calls for
+    ``reset_timeout`` seconds. Then one trial call is let through (half-open): success closes
+    the breaker, failure opens it again.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self.total_failures = 0
+        self.total_rejected = 0
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        self.total_rejected += 1
+        return False
+
+    def release_trial(self) -> None:
+        """Give back a half-open trial slot without a verdict (cancelled, or a non-retryable error)."""
+        self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.total_failures += 1
+        self._failures += 1
+        if self._trial_in_flight or self._failures >= self.failure_threshold:
+            if self._opened_at is None or self._trial_in_flight:
+                self.times_opened += 1
+            self._opened_at = time.monotonic()
+        self._trial_in_flight = False
+
+    def snapshot(self) -> dict:
+        return {
+            "name": self.name,
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "total_failures": self.total_failures,
+            "total_rejected": self.total_rejected,
+            "times_opened": self.times_opened,
+        }
+
+
+def is_retryable(exc: BaseException) -> bool:
+    if isinstance(exc, (asyncio.TimeoutError, ConnectionError)):
+        return True
+    code = getattr(exc, "code", None) or getattr(exc, "status_code", None)
+    if isinstance(code, int):
+        return code in RETRYABLE_STATUS
+    # Transport-level errors from httpx (used by the Gemini SDK) carry no status code
+    return type(exc).__module__.startswith(("httpx", "httpcore"))
+
+
+async def call_with_retries(
+    fn: Callable[[], Awaitable[T]],
+    *,
+    breaker: CircuitBreaker,
+    budget: float,
+    attempt_timeout: float,
+    max_attempts: int,
+    base_delay: float,
+) -> T:
+    """Run ``fn`` with a per-attempt timeout, retrying transient failures within ``budget`` seconds.
+
+    Backoff uses full jitter (uniform in [0, base_delay * 2**attempt]). No retry is started if it
+    could not finish before the budget runs out. Non-retryable errors (e.g. a 400) are raised at
+    once and don't count for or against the breaker; a cancelled attempt releases its
+    half-open trial slot.
+    """
+    deadline = time.monotonic() + budget
+    attempt = 0
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise asyncio.TimeoutError(f"{breaker.name} time budget exhausted")
+        trial = breaker.state == "half_open"
+        if not breaker.allow():
+            raise CircuitOpenError(f"{breaker.name} circuit is open")
+        try:
+            result = await asyncio.wait_for(fn(), min(attempt_timeout, remaining))
+        except Exception as e:
+            if not is_retryable(e):
+                # Upstream answered; the request itself was bad. No verdict either way.
+                if trial:
+                    breaker.release_trial()
+                raise
+            breaker.record_failure()
+            error = e
+        except BaseException:
+            # Cancelled (client went away, an outer deadline): free the trial slot, or the
+            # breaker would stay half-open with a trial "in flight" forever
+            if trial:
+                breaker.release_trial()
+            raise
+        else:
+            breaker.record_success()
+            return result
+        attempt += 1
+        delay = random.uniform(0, base_delay * (2 ** attempt))
+        if attempt >= max_attempts or time.monotonic() + delay >= deadline:
+            raise error
+        print(f"[DEBUG] {breaker.name} attempt {attempt} failed ({error!r}); retrying in {delay:.2f}s")
+        await asyncio.sleep(delay)
@@ -1,8 +1,41 @@
-"""Fetch universities from Hipolabs API and enrich with cost/acceptance logic."""
-import httpx
-from typing import List, Optional
+"""Search the local university catalog and enrich results with cost/acceptance logic.
+
+The catalog is loaded from a Hipolabs dump by ``ingest_universities.py``; the live Hipolabs
+API is only a refresh source (and an optional fallback for empty results).
+"""
+import base64
+import json
+import re
+import unicodedata
+from typing import Any, AsyncIterator, List, Optional, Tuple
+
+from sqlalchemy import func, select, tuple_
+
+from config import settings
+from database import AsyncSessionLocal
+from models.university import University
+from services import http
+from services.cache import AsyncTTLCache
 
 HIPOLABS_URL = "http://universities.hipolabs.com/search"
+# Search page size; recommendations ask for a larger candidate pool to rank
+MAX_RESULTS = 80
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+_search_cache: AsyncTTLCache[List[dict]] = AsyncTTLCache(
+    "universities_search",
+    maxsize=settings.universities_cache_size,
+    ttl=settings.universities_cache_ttl_seconds,
+    stale_ttl=settings.universities_cache_stale_seconds,
+)
+# Pages of search_universities: {"universities": [...], "next_cursor": ..., "total": ...}
+_page_cache: AsyncTTLCache[dict] = AsyncTTLCache(
+    "universities_search_pages",
+    maxsize=settings.universities_cache_size,
+    ttl=settings.universities_cache_ttl_seconds,
+    stale_ttl=settings.universities_cache_stale_seconds,
+)
 
 # Average annual tuition in INR for different countries
 COUNTRY_COSTS = {
@@ -31,52 +64,267 @@ COUNTRY_ACCEPTANCE = {
 }
 
 
-async def fetch_universities(country: Optional[str] = None, name: Optional[str] = None) -> List[dict]:
+def normalize_name(name: str) -> str:
+    """Lower-case, fold diacritics and collapse punctuation/whitespace ("Zürich" -> "zurich")."""
+    folded = unicodedata.normalize("NFKD", name)
+    folded = "".join(ch for ch in folded if not unicodedata.combining(ch)).lower()
+    return " ".join(_NON_ALNUM.sub(" ", folded).split())
+
+
+def _enrich(name_val: str, country_val: str, domain: Optional[str], web_page: Optional[str]) -> dict:
+    # Get actual costs and acceptance rates
+    cost_inr = COUNTRY_COSTS.get(country_val, 1000000)  # Default to 10 lakhs
+    acceptance_pct = COUNTRY_ACCEPTANCE.get(country_val, 50)  # Default to 50%
+    return {
+        "name": name_val,
+        "country": country_val,
+        "domain": domain,
+        "web_page": web_page,
+        "cost_level": f"₹{cost_inr:,.0f}",  # Format with rupee symbol
+        "acceptance_chance": f"{acceptance_pct}%",
+        "annual_cost_inr": cost_inr,
+        "acceptance_pct": acceptance_pct,
+        "fit_reason": f"Matches preferred country ({country_val}). Average annual tuition: ₹{cost_inr:,.0f}.",
+        "risks": f"Acceptance rate approximately {acceptance_pct}%. Ensure strong profile and SOP.",
+    }
+
+
+async def fetch_universities(
+    country: Optional[str] = None,
+    name: Optional[str] = None,
+    limit: int = MAX_RESULTS,
+) -> List[dict]:
+    """Search the local catalog (see ingest_universities.py); same matching as the Hipolabs API.
+
+    ``country`` is an exact match and ``name`` a substring match on the normalized name. Results
+    are cached per (country, name) with stale-while-revalidate; callers get their own copies.
+    """
+    country = (country or "").strip() or None
+    needle = normalize_name(name) if name else ""
+    try:
+        results = await _search_cache.get_or_load(
+            (country, needle, limit), lambda: _search_catalog(country, needle, name, limit),
+        )
+    except Exception as e:
+        print(f"[DEBUG] Error querying university catalog: {e}. Returning empty list.")
+        return []
+    return [dict(r) for r in results]
+
+
+async def search_universities(
+    country: Optional[str] = None,
+    name: Optional[str] = None,
+    page_size: int = MAX_RESULTS,
+    cursor: Optional[str] = None,
+) -> dict:
+    """One page of catalog search results, ordered by (normalized name, id).
+
+    Returns ``universities``, ``next_cursor`` (None on the last page) and ``total`` matches.
+    Raises ValueError for a malformed cursor.
+    """
+    after = decode_cursor(cursor) if cursor else None
+    country = (country or "").strip() or None
+    needle = normalize_name(name) if name else ""
+    try:
+        page = await _page_cache.get_or_load(
+            (country, needle, page_size, cursor),
+            lambda: _search_page(country, needle, name, page_size, after),
+        )
+    except Exception as e:
+        print(f"[DEBUG] Error querying university catalog: {e}. Returning empty page.")
+        return {"universities": [], "next_cursor": None, "total": 0}
+    return {**page, "universities": [dict(r) for r in page["universities"]]}
+
+
+def encode_cursor(name_normalized: str, university_id: str) -> str:
+    raw = json.dumps([name_normalized, university_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        name_normalized, university_id = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(name_normalized, str) or not isinstance(university_id, str):
+        raise ValueError("Invalid cursor")
+    return name_normalized, university_id
+
+
+def _filtered(query, country: Optional[str], needle: str):
+    if country:
+        query = query.where(University.country == country)
+    if needle:
+        query = query.where(University.name_normalized.contains(needle, autoescape=True))
+    return query
+
+
+def _rows_to_results(rows) -> List[dict]:
+    return [
+        _enrich(r.name, r.country, (r.domains or [None])[0], (r.web_pages or [None])[0])
+        for r in rows
+    ]
+
+
+# Set once the catalog is known to have rows (it is never emptied at runtime)
+_catalog_loaded = False
+
+
+async def _live_fallback(db) -> bool:
+    """Whether an empty result should be answered from the live API.
+
+    Always when configured, and otherwise while the catalog hasn't been ingested yet, so a fresh
+    deploy still serves Hipolabs data.
+    """
+    global _catalog_loaded
+    if settings.universities_live_fallback:
+        return True
+    if not _catalog_loaded:
+        _catalog_loaded = (await db.execute(select(University.id).limit(1))).first() is not None
+    return not _catalog_loaded
+
+
+async def _search_catalog(country: Optional[str], needle: str, name: Optional[str], limit: int) -> List[dict]:
+    query = _filtered(select(
+        University.name, University.country, University.domains, University.web_pages,
+    ), country, needle)
+    query = query.order_by(University.name_normalized, University.id).limit(limit)
+
+    async with AsyncSessionLocal() as db:
+        rows = (await db.execute(query)).all()
+        fallback = not rows and await _live_fallback(db)
+    if fallback:
+        return await fetch_universities_live(country=country, name=name, limit=limit)
+    return _rows_to_results(rows)
+
+
+async def _search_page(
+    country: Optional[str],
+    needle: str,
+    name: Optional[str],
+    page_size: int,
+    after: Optional[Tuple[str, str]],
+) -> dict:
+    query = _filtered(select(
+        University.id, University.name_normalized,
+        University.name, University.country, University.domains, University.web_pages,
+    ), country, needle)
+    if after is not None:
+        # Keyset pagination: (name_normalized, id) > cursor, served by the name indexes
+        query = query.where(tuple_(University.name_normalized, University.id) > tuple_(*after))
+    query = query.order_by(University.name_normalized, University.id).limit(page_size + 1)
+    count_query = _filtered(select(func.count()).select_from(University), country, needle)
+
+    async with AsyncSessionLocal() as db:
+        rows = (await db.execute(query)).all()
+        total = (await db.execute(count_query)).scalar_one()
+        fallback = not total and after is None and await _live_fallback(db)
+    if fallback:
+        live = await fetch_universities_live(country=country, name=name, limit=page_size)
+        return {"universities": live, "next_cursor": None, "total": len(live)}
+
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = encode_cursor(rows[-1].name_normalized, rows[-1].id)
+    return {"universities": _rows_to_results(rows), "next_cursor": next_cursor, "total": total}
+
+
+async def fetch_universities_live(
+    country: Optional[str] = None,
+    name: Optional[str] = None,
+    limit: int = MAX_RESULTS,
+) -> List[dict]:
+    """Query the Hipolabs API directly (only when ``UNIVERSITIES_LIVE_FALLBACK`` is on)."""
     params = {}
     if country:
         params["country"] = country
     if name:
         params["name"] = name
-    
+
+    # Parse records as they arrive and stop reading once ``limit`` unique ones are in hand
+    out = []
+    seen = set()
+    read = 0
     try:
-        async with httpx.AsyncClient(timeout=httpx.Timeout(30.0)) as client:
-            print(f"[DEBUG] Fetching universities with params: {params}")
-            r = await client.get(HIPOLABS_URL, params=params or None)
+        print(f"[DEBUG] Fetching universities with params: {params}")
+        async with http.get_client().stream("GET", HIPOLABS_URL, params=params or None) as r:
             r.raise_for_status()
-            data = r.json()
-            print(f"[DEBUG] Received {len(data)} universities from API for {country}")
+            async for u in iter_json_array(r.aiter_text()):
+                read += 1
+                if not isinstance(u, dict):
+                    continue
+                name_val = (u.get("name") or "").strip()
+                country_val = (u.get("country") or "").strip()
+                key = (name_val, country_val)
+                if key in seen or not name_val:
+                    continue
+                seen.add(key)
+                out.append(_enrich(
+                    name_val,
+                    country_val,
+                    u.get("domains", [None])[0] if u.get("domains") else None,
+                    u.get("web_pages", [None])[0] if u.get("web_pages") else None,
+                ))
+                if len(out) >= limit:
+                    break
+        print(f"[DEBUG] Read {read} universities from API for {country}")
     except Exception as e:
-        print(f"[DEBUG] Error fetching from Hipolabs API: {e}. Returning empty list.")
-        return []  # Graceful fallback on API error
-    
-    # Limit for prototype
-    out = []
-    seen = set()
-    for u in (data or [])[:80]:
-        name_val = (u.get("name") or "").strip()
-        country_val = (u.get("country") or "").strip()
-        key = (name_val, country_val)
-        if key in seen or not name_val:
-            continue
-        seen.add(key)
-        
-        # Get actual costs and acceptance rates
-        cost_inr = COUNTRY_COSTS.get(country_val, 1000000)  # Default to 10 lakhs
-        acceptance_pct = COUNTRY_ACCEPTANCE.get(country_val, 50)  # Default to 50%
-        
-        out.append({
-            "name": name_val,
-            "country": country_val,
-            "domain": u.get("domains", [None])[0] if u.get("domains") else None,
-            "web_page": u.get("web_pages", [None])[0] if u.get("web_pages") else None,
-            "cost_level": f"₹{cost_inr:,.0f}",  # Format with rupee symbol
-            "acceptance_chance": f"{acceptance_pct}%",
-            "fit_reason": f"Matches preferred country ({country_val}). Average annual tuition: ₹{cost_inr:,.0f}.",
-            "risks": f"Acceptance rate approximately {acceptance_pct}%. Ensure strong profile and SOP.",
-        })
+        # Graceful fallback on API error: keep whatever was parsed before it
+        print(f"[DEBUG] Error fetching from Hipolabs API: {e}. Returning {len(out)} universities.")
     return out
 
 
+async def iter_json_array(chunks: AsyncIterator[str]) -> AsyncIterator[Any]:
+    """Yield the elements of a top-level JSON array as its text arrives in ``chunks``.
+
+    Each element is decoded with ``JSONDecoder.raw_decode`` once it is complete in the buffer,
+    so memory is bounded by the largest element rather than the whole document.
+    """
+    decoder = json.JSONDecoder()
+    buf = ""
+    pos = 0
+    started = False
+    chunks = chunks.__aiter__()
+    exhausted = False
+    while True:
+        # Skip whitespace and separators up to the next element
+        while pos < len(buf) and buf[pos] in " \t\r\n,":
+            pos += 1
+        if pos < len(buf):
+            if not started:
+                if buf[pos] != "[":
+                    raise ValueError("Expected a JSON array")
+                started = True
+                pos += 1
+                continue
+            if buf[pos] == "]":
+                return
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if exhausted:
+                    raise
+            else:
+                # Objects, arrays and strings end at their closing character. raw_decode stops a
+                # number at the first character that can't continue it ("[1." decodes 1), so a
+                # scalar only counts once a separator follows it.
+                if exhausted or buf[pos] in "{[\"" or (end < len(buf) and buf[end] in " \t\r\n,]"):
+                    yield item
+                    pos = end
+                    continue
+        elif exhausted:
+            raise ValueError("Unexpected end of JSON array")
+        try:
+            chunk = await chunks.__anext__()
+        except StopAsyncIteration:
+            exhausted = True
+            continue
+        buf = buf[pos:] + chunk
+        pos = 0
+
+
 def _cost_level(country: str) -> str:
     # Kept for backward compatibility, returns actual cost now
     return f"₹{COUNTRY_COSTS.get(country, 1000000):,.0f}"
@@ -0,0 +1,71 @@
+"""Per-user data versions and conditional GETs (strong ETags, 304 Not Modified).
+
+Every write to a user's data (profile, todos, shortlist, chat and counsellor actions) bumps
+``users.data_version`` in the same transaction. Read endpoints derive their ETag from it, so a
+client revalidating an unchanged resource gets a 304 after one primary-key lookup instead of
+the endpoint's queries and serialization.
+"""
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from models.user import User
+
+# Bump when a versioned endpoint's response shape changes, so old cached bodies are not revalidated
+REPRESENTATION_VERSION = "1"
+# Sent with versioned responses: browsers may keep them but must revalidate (If-None-Match) first
+CACHE_CONTROL = "private, no-cache"
+
+
+def _bump_stmt(user_id: str):
+    # Bulk UPDATE: no ORM events, so the auth user-cache entry is left alone
+    return (
+        update(User)
+        .where(User.id == user_id)
+        .values(data_version=User.data_version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def bump_data_version(db: Session, user_id: str) -> None:
+    """Mark the user's data changed; call before the mutation's commit."""
+    db.execute(_bump_stmt(user_id))
+
+
+async def bump_data_version_async(db: AsyncSession, user_id: str) -> None:
+    await db.execute(_bump_stmt(user_id))
+
+
+def get_data_version(db: Session, user_id: str) -> int:
+    return db.execute(select(User.data_version).where(User.id == user_id)).scalar_one_or_none() or 0
+
+
+def make_etag(request: Request, resource: str, user_id: str, version: int) -> str:
+    # The user id is hashed in so a shared browser cache never revalidates another user's body;
+    # the query string is hashed in because filters change the representation
+    key = f"{user_id}|{request.url.query}|{REPRESENTATION_VERSION}"
+    digest = hashlib.sha1(key.encode()).hexdigest()[:16]
+    return f'"{resource}-{digest}-{version}"'
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison: ignore a W/ prefix
+    candidates = (c.strip() for c in if_none_match.split(","))
+    return any((c[2:] if c.startswith("W/") else c) == etag for c in candidates)
+
+
+def conditional_get(request: Request, response: Response, resource: str, db: Session, user_id: str) -> Optional[Response]:
+    """Return a 304 response if the client's copy is current; otherwise tag ``response`` and return None."""
+    etag = make_etag(request, resource, user_id, get_data_version(db, user_id))
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,40 @@
+from services.amounts import MAX_COST_INR, parse_acceptance_pct, parse_cost_inr
+
+
+def test_rupee_amount_wins_over_converted_alternatives():
+    assert parse_cost_inr("₹30,00,000 (~$36,000)") == 3_000_000
+    assert parse_cost_inr("₹8,50,000 per year (€9,500)") == 850_000
+    assert parse_cost_inr("€9,500 (~₹8.5 lakh)") == 850_000
+
+
+def test_fx_rate_applies_to_the_marked_amount():
+    assert parse_cost_inr("$36k per year") == 36_000 * 83
+    assert parse_cost_inr("USD 40,000") == 40_000 * 83
+    assert parse_cost_inr("£20,000 - £25,000") == 20_000 * 105
+
+
+def test_magnitudes_and_ranges():
+    assert parse_cost_inr("₹19.5 lakh") == 1_950_000
+    assert parse_cost_inr("around 10-15 lakh") == 1_000_000
+    assert parse_cost_inr("about 2.5 cr") == 25_000_000
+    assert parse_cost_inr("high") is None
+
+
+def test_out_of_range_costs_are_rejected():
+    assert parse_cost_inr("3000 million") is None
+    assert parse_cost_inr(MAX_COST_INR + 1) is None
+    assert parse_cost_inr(-5) is None
+
+
+def test_acceptance():
+    assert parse_acceptance_pct("around 10-15%") == 10
+    assert parse_acceptance_pct("0.35") == 35
+    assert parse_acceptance_pct(0.35) == 35
+    assert parse_acceptance_pct("competitive") is None
+
+
+def test_bare_small_whole_numbers_are_percentages():
+    assert parse_acceptance_pct("1") == 1
+    assert parse_acceptance_pct("0") == 0
+    assert parse_acceptance_pct(1) == 1
+    assert parse_acceptance_pct("1%") == 1
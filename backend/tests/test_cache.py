@@ -0,0 +1,46 @@
+import asyncio
+
+import pytest
+
+from services.cache import AsyncTTLCache
+
+
+def test_miss_joining_a_failed_refresh_gets_the_error():
+    async def scenario():
+        cache = AsyncTTLCache("test_join", maxsize=8, ttl=0.0, stale_ttl=60.0)
+        assert await cache.get_or_load("k", lambda: asyncio.sleep(0, [1])) == [1]
+
+        release = asyncio.Event()
+
+        async def failing():
+            await release.wait()
+            raise RuntimeError("upstream down")
+
+        # Stale hit: served at once, refresh starts in the background
+        assert await cache.get_or_load("k", failing) == [1]
+        cache.clear()
+        # A miss now joins the running refresh and must see its failure, not None
+        joined = asyncio.create_task(cache.get_or_load("k", lambda: asyncio.sleep(0, [2])))
+        await asyncio.sleep(0)
+        release.set()
+        with pytest.raises(RuntimeError):
+            await joined
+        # Failures aren't cached: the next miss loads again
+        assert await cache.get_or_load("k", lambda: asyncio.sleep(0, [3])) == [3]
+
+    asyncio.run(scenario())
+
+
+def test_failed_background_refresh_keeps_the_stale_value():
+    async def scenario():
+        cache = AsyncTTLCache("test_stale", maxsize=8, ttl=0.0, stale_ttl=60.0)
+        await cache.get_or_load("k", lambda: asyncio.sleep(0, "old"))
+
+        async def failing():
+            raise RuntimeError("upstream down")
+
+        assert await cache.get_or_load("k", failing) == "old"
+        await asyncio.sleep(0.01)
+        assert await cache.get_or_load("k", failing) == "old"
+
+    asyncio.run(scenario())
@@ -0,0 +1,34 @@
+import asyncio
+
+import pytest
+
+from services.universities import iter_json_array
+
+
+async def _chunks(parts):
+    for part in parts:
+        yield part
+
+
+def _parse(parts):
+    async def collect():
+        return [item async for item in iter_json_array(_chunks(parts))]
+
+    return asyncio.run(collect())
+
+
+def test_number_split_across_chunks():
+    assert _parse(["[1.", "5]"]) == [1.5]
+    assert _parse(["[12", "3, 4", "e2, tr", "ue, nu", "ll]"]) == [123, 400.0, True, None]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 1000])
+def test_every_chunk_boundary(size):
+    text = '[{"name": "A \\"B\\"", "n": [1, 2]}, 1.25, "x]", -3e-2, false, {"domains": []}]'
+    parts = [text[i:i + size] for i in range(0, len(text), size)]
+    assert _parse(parts) == [{"name": 'A "B"', "n": [1, 2]}, 1.25, "x]", -0.03, False, {"domains": []}]
+
+
+def test_truncated_array_raises():
+    with pytest.raises(ValueError):
+        _parse(['[{"a": 1}, {"b"'])
@@ -0,0 +1,21 @@
+import asyncio
+
+from services.llm_limits import LLMLimiter
+
+
+def test_waiting_job_outlasts_the_request_queue_timeout():
+    async def scenario():
+        limiter = LLMLimiter(4, 8, 0.2, "reject")
+        results = []
+
+        async def job(name, seconds):
+            async with limiter.slot("user", single_flight="wait", timeout=2.0):
+                await asyncio.sleep(seconds)
+            results.append(name)
+
+        first = asyncio.create_task(job("job1", 0.5))
+        await asyncio.sleep(0)
+        await asyncio.gather(first, job("job2", 0.1))
+        return results
+
+    assert asyncio.run(scenario()) == ["job1", "job2"]
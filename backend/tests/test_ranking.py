@@ -0,0 +1,36 @@
+import numpy as np
+
+from services.ranking import RankingProfile, rank_candidates, score
+from services.universities import _enrich
+
+DEFAULT_COUNTRIES = ["United States", "United Kingdom", "Canada"]
+
+
+def _candidates(per_country: int = 20) -> list:
+    return [
+        _enrich(f"{country} University {i:02d}", country, None, None)
+        for country in DEFAULT_COUNTRIES
+        for i in range(per_country)
+    ]
+
+
+def test_default_inputs_fill_every_category():
+    result = rank_candidates(_candidates(), RankingProfile(), k=5)
+    assert all(len(result[cat]) == 5 for cat in ("dream", "target", "safe"))
+    # The most selective country is the reach, the least selective the safe bet
+    assert {r["country"] for r in result["dream"]} == {"United States"}
+    assert {r["country"] for r in result["safe"]} == {"Canada"}
+
+
+def test_single_country_pool_is_still_split():
+    candidates = [_enrich(f"University {i}", "Germany", None, None) for i in range(9)]
+    result = rank_candidates(candidates, RankingProfile(), k=5)
+    assert [len(result[cat]) for cat in ("dream", "target", "safe")] == [3, 3, 3]
+
+
+def test_budget_min_lowers_affordability_of_much_cheaper_options():
+    cost = np.array([200000.0, 1500000.0])
+    acceptance = np.array([0.5, 0.5])
+    country_match = np.zeros(2)
+    _, fit, _ = score(cost, acceptance, country_match, RankingProfile(budget_min=1000000, budget_max=2000000))
+    assert fit[0] < fit[1]
@@ -0,0 +1,67 @@
+import asyncio
+
+from services.resilience import CircuitBreaker, CircuitOpenError, call_with_retries
+
+
+def _half_open_breaker() -> CircuitBreaker:
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0.0)
+    breaker.record_failure()
+    assert breaker.state == "half_open"
+    return breaker
+
+
+async def _call(breaker, fn):
+    return await call_with_retries(
+        fn, breaker=breaker, budget=5.0, attempt_timeout=5.0, max_attempts=1, base_delay=0.0,
+    )
+
+
+def test_cancelled_half_open_trial_releases_the_slot():
+    async def scenario():
+        breaker = _half_open_breaker()
+        started = asyncio.Event()
+
+        async def hang():
+            started.set()
+            await asyncio.sleep(60)
+
+        trial = asyncio.create_task(_call(breaker, hang))
+        await started.wait()
+        # While the trial runs, everything else is rejected
+        try:
+            await _call(breaker, lambda: asyncio.sleep(0, "ok"))
+        except CircuitOpenError:
+            pass
+        else:
+            raise AssertionError("second call got through during the trial")
+
+        trial.cancel()
+        try:
+            await trial
+        except asyncio.CancelledError:
+            pass
+        assert breaker.state == "half_open"
+        # The next call becomes the new trial and closes the breaker
+        assert await _call(breaker, lambda: asyncio.sleep(0, "ok")) == "ok"
+        assert breaker.state == "closed"
+
+    asyncio.run(scenario())
+
+
+def test_non_retryable_error_releases_trial_without_a_verdict():
+    class BadRequest(Exception):
+        code = 400
+
+    async def bad():
+        raise BadRequest()
+
+    async def scenario():
+        breaker = _half_open_breaker()
+        try:
+            await _call(breaker, bad)
+        except BadRequest:
+            pass
+        assert breaker.state == "half_open"
+        assert breaker.allow()
+
+    asyncio.run(scenario())
@@ -116,8 +116,18 @@ export default function CounsellorPage() {
     setInput("");
     setSending(true);
     setMessage("");
+    const pendingId = `pending-${Date.now()}`;
+    setHistory((h) => [
+      ...h,
+      { id: `${pendingId}-user`, role: "user", content: text },
+      { id: pendingId, role: "assistant", content: "" },
+    ]);
     try {
-      const { message: msg } = await counsellorApi.chat(text);
+      await counsellorApi.chatStream(text, (delta) =>
+        setHistory((h) =>
+          h.map((m) => (m.id === pendingId ? { ...m, content: m.content + delta } : m))
+        )
+      );
       setHistory(await counsellorApi.history());
       setMessage("");
     } catch (e: unknown) {
@@ -24,6 +24,8 @@ export default function UniversitiesPage() {
   } | null>(null);
   const [searchCountry, setSearchCountry] = useState("");
   const [searchResults, setSearchResults] = useState<UniversitySearch[]>([]);
+  const [searchCursor, setSearchCursor] = useState<string | null>(null);
+  const [searchTotal, setSearchTotal] = useState(0);
   const [loadingRec, setLoadingRec] = useState(true);
   const [loadingSearch, setLoadingSearch] = useState(false);
   const [lockWarning, setLockWarning] = useState<{ id: string; name: string } | null>(null);
@@ -101,14 +103,17 @@ export default function UniversitiesPage() {
     loadShortlist();
   };
 
-  const runSearch = async () => {
+  const runSearch = async (cursor?: string) => {
     if (!searchCountry.trim()) return;
     setLoadingSearch(true);
     try {
-      const { universities } = await universitiesApi.search({ country: searchCountry.trim() });
-      setSearchResults(universities);
+      const page = await universitiesApi.search({ country: searchCountry.trim(), cursor });
+      setSearchResults((prev) => (cursor ? [...prev, ...page.universities] : page.universities));
+      setSearchCursor(page.next_cursor);
+      setSearchTotal(page.total);
     } catch {
-      setSearchResults([]);
+      if (!cursor) setSearchResults([]);
+      setSearchCursor(null);
     } finally {
       setLoadingSearch(false);
     }
@@ -299,13 +304,16 @@ export default function UniversitiesPage() {
                   placeholder="e.g. United Kingdom"
                   className="input flex-1"
                 />
-                <button type="button" onClick={runSearch} className="btn-primary" disabled={loadingSearch}>
+                <button type="button" onClick={() => runSearch()} className="btn-primary" disabled={loadingSearch}>
                   {loadingSearch ? "…" : "Search"}
                 </button>
               </div>
               {searchResults.length > 0 && (
                 <div className="space-y-2 max-h-[calc(100vh-300px)] overflow-y-auto">
-                  {searchResults.slice(0, 30).map((u) => (
+                  <p className="text-xs text-slate-500">
+                    Showing {searchResults.length} of {searchTotal}
+                  </p>
+                  {searchResults.map((u) => (
                     <div key={`${u.name}-${u.country}`} className="border border-slate-200 rounded p-3 bg-white hover:shadow-sm transition text-xs">
                       <div className="flex items-start justify-between gap-2 mb-1">
                         <div className="flex-1 min-w-0">
@@ -335,6 +343,16 @@ export default function UniversitiesPage() {
                       )}
                     </div>
                   ))}
+                  {searchCursor && (
+                    <button
+                      type="button"
+                      onClick={() => runSearch(searchCursor)}
+                      className="btn-secondary w-full text-xs"
+                      disabled={loadingSearch}
+                    >
+                      {loadingSearch ? "…" : "Load more"}
+                    </button>
+                  )}
                 </div>
               )}
             </div>
@@ -50,13 +50,40 @@ export const dashboard = {
 };
 
 export const universities = {
-  search: (params: { country?: string; name?: string }) => {
+  search: (params: { country?: string; name?: string; cursor?: string; pageSize?: number }) => {
     const q = new URLSearchParams();
     if (params.country) q.set("country", params.country);
     if (params.name) q.set("name", params.name);
-    return api<{ universities: UniversitySearch[] }>(`/universities/search?${q}`);
+    if (params.cursor) q.set("cursor", params.cursor);
+    if (params.pageSize) q.set("page_size", String(params.pageSize));
+    return api<{
+      universities: UniversitySearch[];
+      next_cursor: string | null;
+      total: number;
+      page_size: number;
+    }>(`/universities/search?${q}`);
+  },
+  autocomplete: (query: string, country?: string) => {
+    const q = new URLSearchParams({ q: query });
+    if (country) q.set("country", country);
+    return api<{
+      suggestions: { name: string; country: string; domain: string | null; web_page: string | null }[];
+    }>(`/universities/autocomplete?${q}`);
+  },
+  shortlist: (params?: {
+    minCost?: number;
+    maxCost?: number;
+    minAcceptance?: number;
+    sort?: "cost" | "-cost" | "acceptance" | "-acceptance";
+  }) => {
+    const q = new URLSearchParams();
+    if (params?.minCost != null) q.set("min_cost", String(params.minCost));
+    if (params?.maxCost != null) q.set("max_cost", String(params.maxCost));
+    if (params?.minAcceptance != null) q.set("min_acceptance", String(params.minAcceptance));
+    if (params?.sort) q.set("sort", params.sort);
+    const qs = q.toString();
+    return api<UniversityShortlistItem[]>(`/universities/shortlist${qs ? `?${qs}` : ""}`);
   },
-  shortlist: () => api<UniversityShortlistItem[]>("/universities/shortlist"),
   addShortlist: (data: UniversityShortlistCreate) =>
     api<UniversityShortlistItem>("/universities/shortlist", {
       method: "POST",
@@ -70,7 +97,12 @@ export const universities = {
       body: JSON.stringify({ lock }),
     }),
   recommendations: () =>
-    api<{ dream: UniversitySearch[]; target: UniversitySearch[]; safe: UniversitySearch[] }>(
+    api<{
+      dream: UniversitySearch[];
+      target: UniversitySearch[];
+      safe: UniversitySearch[];
+      timed_out_countries: string[];
+    }>(
       "/universities/recommendations"
     ),
 };
@@ -92,6 +124,50 @@ export const counsellor = {
       method: "POST",
       body: JSON.stringify({ content }),
     }),
+  // Streams the reply over Server-Sent Events; onDelta receives text as it arrives.
+  chatStream: async (
+    content: string,
+    onDelta: (text: string) => void
+  ): Promise<{ message: string; actions?: unknown[] }> => {
+    const token = getToken();
+    const headers: Record<string, string> = { "Content-Type": "application/json" };
+    if (token) headers["Authorization"] = `Bearer ${token}`;
+    const res = await fetch(`${API_BASE}/counsellor/chat/stream`, {
+      method: "POST",
+      headers,
+      body: JSON.stringify({ content }),
+    });
+    if (!res.ok || !res.body) {
+      const err = await res.json().catch(() => ({ detail: res.statusText }));
+      throw new Error(err.detail || JSON.stringify(err));
+    }
+    const reader = res.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = "";
+    let result: { message: string; actions?: unknown[] } | null = null;
+    for (;;) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+      let sep: number;
+      while ((sep = buffer.indexOf("\n\n")) !== -1) {
+        const raw = buffer.slice(0, sep);
+        buffer = buffer.slice(sep + 2);
+        let event = "message";
+        let data = "";
+        for (const line of raw.split("\n")) {
+          if (line.startsWith("event: ")) event = line.slice(7);
+          else if (line.startsWith("data: ")) data += line.slice(6);
+        }
+        if (!data) continue;
+        const payload = JSON.parse(data);
+        if (event === "delta") onDelta(payload.text);
+        else if (event === "done") result = payload;
+      }
+    }
+    if (!result) throw new Error("Stream ended unexpectedly");
+    return result;
+  },
 };
 
 export const applications = {
@@ -175,6 +251,8 @@ export interface UniversityShortlistItem extends UniversityShortlistCreate {
   id: string;
   user_id: string;
   locked: boolean;
+  annual_cost_inr?: number | null;
+  acceptance_pct?: number | null;
 }
 
 export interface TodoItem {